@@ -21,13 +21,16 @@ def upgrade() -> None:
     # create_type=False stops SQLAlchemy's Table.before_create hook from
     # trying to auto-create the same enum a second time when the column
     # type below references it. checkfirst=True keeps the explicit create
-    # idempotent on partial re-runs.
+    # idempotent on partial re-runs. The type is committed on its own
+    # (autocommit block) so its catalog locks are not held for the rest of
+    # the migration.
     removal_request_status = postgresql.ENUM(
         'PENDING', 'APPROVED', 'REJECTED', 'CANCELLED',
         name='removalrequeststatus',
         create_type=False,
     )
-    removal_request_status.create(op.get_bind(), checkfirst=True)
+    with op.get_context().autocommit_block():
+        removal_request_status.create(op.get_bind(), checkfirst=True)
 
     op.create_table('student_removal_requests',
         sa.Column('id', sa.UUID(), nullable=False),
@@ -0,0 +1,39 @@
+"""Add (admin_id, student_id) index on students
+
+Revision ID: a9b0c1d2e3f4
+Revises: z8a9b0c1d2e3
+Create Date: 2026-10-16 16:00:00.000000
+
+GET /admin/attendance lists one admin's checked-in students ordered by their
+library student ID and pages in SQL; this index supplies that order per admin.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a9b0c1d2e3f4"
+down_revision = "z8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_students_admin_student_id",
+            "students",
+            ["admin_id", "student_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_students_admin_student_id",
+            table_name="students",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Add index on admin_details.user_id
+
+Revision ID: c2d3e4f5a6b7
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-16 18:00:00.000000
+
+Nearly every admin request resolves the library through
+admin_details.user_id (/admin/details, the /stats total_seats subquery,
+student ID generation, subscription plans), and the column had no index. It
+is left non-unique: a concurrent unique build would fail, and leave an
+INVALID index behind, on any database that already holds a duplicate row.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c2d3e4f5a6b7"
+down_revision = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_admin_details_user_id",
+            "admin_details",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_admin_details_user_id",
+            table_name="admin_details",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
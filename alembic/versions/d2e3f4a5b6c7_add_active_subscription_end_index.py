@@ -0,0 +1,43 @@
+"""Add partial index on students.subscription_end for active subscriptions
+
+Revision ID: d2e3f4a5b6c7
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-16 19:00:00.000000
+
+The subscription scheduler jobs look up Active students whose subscription
+ends on a milestone day (5/3/1 days out) or has already ended. Both filter on
+subscription_status = 'Active' plus a subscription_end range; indexing only
+active rows keeps the index small as expired and removed students accumulate.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2e3f4a5b6c7"
+down_revision = "c2d3e4f5a6b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_students_active_subscription_end",
+            "students",
+            ["subscription_end"],
+            unique=False,
+            postgresql_where=sa.text("subscription_status = 'Active'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_students_active_subscription_end",
+            table_name="students",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Add index on students.password_reset_token
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-16 20:00:00.000000
+
+The student password setup/reset endpoints look the student up by
+password_reset_token, which had no index. The matching admin_users columns
+(email, email_verification_token, password_reset_token) and students.email /
+students.student_id are already indexed by earlier revisions or their unique
+constraints.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e3f4a5b6c7d8"
+down_revision = "d2e3f4a5b6c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_students_password_reset_token",
+            "students",
+            ["password_reset_token"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_students_password_reset_token",
+            table_name="students",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -5,7 +5,7 @@ Revises: 0585e96f8e45
 Create Date: 2025-08-03 12:15:19.740412
 
 """
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
@@ -15,34 +15,79 @@ down_revision = '0585e96f8e45'
 branch_labels = None
 depends_on = None
 
+BACKFILL_BATCH_SIZE = 1000
+
 
 def upgrade() -> None:
+    # The backfill's autocommit block commits these ALTERs before alembic_version
+    # moves past this revision, so they use IF NOT EXISTS to keep a rerun after
+    # a failed backfill from dying on columns that are already there.
+
     # Add user_type column to referral_codes table
-    op.add_column('referral_codes', sa.Column('user_type', sa.String(), nullable=True))
+    op.execute("ALTER TABLE referral_codes ADD COLUMN IF NOT EXISTS user_type VARCHAR")
     
-    # Add new columns to referrals table
-    op.add_column('referrals', sa.Column('referrer_type', sa.String(), nullable=True))
-    op.add_column('referrals', sa.Column('referred_type', sa.String(), nullable=True))
-    op.add_column('referrals', sa.Column('referred_email', sa.String(), nullable=True))
-    op.add_column('referrals', sa.Column('points_awarded', sa.String(), nullable=True))
-    op.add_column('referrals', sa.Column('notes', sa.Text(), nullable=True))
-    op.add_column('referrals', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    # Add new columns to referrals table and make referred_id nullable in a
+    # single ALTER TABLE, so the table lock is taken once
+    op.execute(
+        "ALTER TABLE referrals "
+        "ADD COLUMN IF NOT EXISTS referrer_type VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS referred_type VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS referred_email VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS points_awarded VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS notes TEXT, "
+        "ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP WITH TIME ZONE, "
+        "ALTER COLUMN referred_id DROP NOT NULL"
+    )
     
-    # Make referred_id nullable
-    op.alter_column('referrals', 'referred_id', nullable=True)
+    # Backfill points_awarded for existing referrals (the model defaults it to "0")
+    _backfill_points_awarded()
+
+
+def _backfill_points_awarded() -> None:
+    """Set points_awarded = '0' on pre-existing rows in primary-key batches.
+
+    Each batch is its own short transaction, walking the primary key (keyset
+    pagination) so no batch rescans the rows handled before it and no single
+    UPDATE holds row locks on the whole table.
+    """
+    if context.is_offline_mode():
+        op.execute("UPDATE referrals SET points_awarded = '0' WHERE points_awarded IS NULL")
+        return
+
+    batch = sa.text(
+        "WITH batch AS ("
+        "  SELECT id FROM referrals"
+        "  WHERE CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)"
+        "  ORDER BY id LIMIT :batch_size"
+        "), updated AS ("
+        "  UPDATE referrals r SET points_awarded = '0'"
+        "  FROM batch WHERE r.id = batch.id AND r.points_awarded IS NULL"
+        ") "
+        "SELECT max(id::text) FROM batch"
+    )
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_id = None
+        while True:
+            last_id = conn.execute(
+                batch, {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}
+            ).scalar()
+            if last_id is None:
+                break
 
 
 def downgrade() -> None:
-    # Remove columns from referrals table
-    op.drop_column('referrals', 'completed_at')
-    op.drop_column('referrals', 'notes')
-    op.drop_column('referrals', 'points_awarded')
-    op.drop_column('referrals', 'referred_email')
-    op.drop_column('referrals', 'referred_type')
-    op.drop_column('referrals', 'referrer_type')
+    # Remove columns from referrals table and make referred_id not nullable again
+    op.execute(
+        "ALTER TABLE referrals "
+        "DROP COLUMN completed_at, "
+        "DROP COLUMN notes, "
+        "DROP COLUMN points_awarded, "
+        "DROP COLUMN referred_email, "
+        "DROP COLUMN referred_type, "
+        "DROP COLUMN referrer_type, "
+        "ALTER COLUMN referred_id SET NOT NULL"
+    )
     
     # Remove user_type column from referral_codes table
     op.drop_column('referral_codes', 'user_type')
-    
-    # Make referred_id not nullable again
-    op.alter_column('referrals', 'referred_id', nullable=False)
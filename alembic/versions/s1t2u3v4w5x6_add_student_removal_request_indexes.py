@@ -0,0 +1,51 @@
+"""Add indexes on student_removal_requests lookup columns
+
+Revision ID: s1t2u3v4w5x6
+Revises: z1y2x3w4v5u6
+Create Date: 2026-10-16 10:00:00.000000
+
+The table was created in 1ee31fc54504 without any index on its foreign keys,
+so every lookup by student/admin is a sequential scan. Indexes are built with
+CREATE INDEX CONCURRENTLY (outside the migration transaction) so the table is
+not locked against writes while they build.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "s1t2u3v4w5x6"
+down_revision = "z1y2x3w4v5u6"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_student_removal_requests_student_id", ["student_id"]),
+    ("ix_student_removal_requests_admin_id", ["admin_id"]),
+    ("ix_student_removal_requests_processed_by", ["processed_by"]),
+    ("ix_student_removal_requests_status_created", ["status", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "student_removal_requests",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="student_removal_requests",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,59 @@
+"""Store student_removal_requests.status as VARCHAR with a CHECK constraint.
+
+Revision ID: t2u3v4w5x6y7
+Revises: s1t2u3v4w5x6
+Create Date: 2026-10-16
+
+The removalrequeststatus PostgreSQL enum makes asyncpg introspect the type
+(an extra pg_type query) on every new connection, and adding a status needs
+ALTER TYPE ... ADD VALUE (see d4e5f6a7b8c9 / p8q9r0s1t2u3). The stored labels
+are unchanged (the Python enum member names), only the column type differs.
+
+"""
+
+from alembic import op
+
+
+revision = "t2u3v4w5x6y7"
+down_revision = "s1t2u3v4w5x6"
+branch_labels = None
+depends_on = None
+
+
+STATUSES = ("PENDING", "APPROVED", "REJECTED", "CANCELLED", "CASH_RECEIVED")
+CONSTRAINT_NAME = "ck_student_removal_requests_status"
+
+
+def _status_list() -> str:
+    return ", ".join(f"'{status}'" for status in STATUSES)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN status TYPE VARCHAR(16) USING status::text"
+    )
+    op.execute(
+        f"ALTER TABLE student_removal_requests ADD CONSTRAINT {CONSTRAINT_NAME} "
+        f"CHECK (status IN ({_status_list()}))"
+    )
+    op.execute("DROP TYPE IF EXISTS removalrequeststatus")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute(f"CREATE TYPE removalrequeststatus AS ENUM ({_status_list()})")
+    op.execute(
+        f"ALTER TABLE student_removal_requests DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}"
+    )
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN status TYPE removalrequeststatus USING status::removalrequeststatus"
+    )
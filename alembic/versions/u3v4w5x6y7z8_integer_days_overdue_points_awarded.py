@@ -0,0 +1,55 @@
+"""Store removal request days_overdue and referral points_awarded as integers.
+
+Revision ID: u3v4w5x6y7z8
+Revises: t2u3v4w5x6y7
+Create Date: 2026-10-16
+
+days_overdue held display text ("3 days overdue" / "expires today") and
+points_awarded a number as text. Existing values are converted to the day /
+point count; anything without digits becomes 0.
+
+"""
+
+from alembic import op
+
+
+revision = "u3v4w5x6y7z8"
+down_revision = "t2u3v4w5x6y7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN days_overdue TYPE INTEGER "
+        "USING COALESCE(substring(days_overdue FROM '[0-9]+')::integer, 0)"
+    )
+    op.execute(
+        "ALTER TABLE referrals "
+        "ALTER COLUMN points_awarded TYPE INTEGER "
+        "USING COALESCE(substring(points_awarded FROM '^\\s*(-?[0-9]+)\\s*$')::integer, 0), "
+        "ALTER COLUMN points_awarded SET DEFAULT 0"
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE referrals "
+        "ALTER COLUMN points_awarded DROP DEFAULT, "
+        "ALTER COLUMN points_awarded TYPE VARCHAR USING points_awarded::text"
+    )
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN days_overdue TYPE VARCHAR(50) "
+        "USING CASE WHEN days_overdue > 0 "
+        "THEN days_overdue::text || ' days overdue' ELSE 'expires today' END"
+    )
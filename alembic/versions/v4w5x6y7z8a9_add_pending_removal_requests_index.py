@@ -0,0 +1,42 @@
+"""Add partial index for the pending removal-request worklist
+
+Revision ID: v4w5x6y7z8a9
+Revises: u3v4w5x6y7z8
+Create Date: 2026-10-16 12:00:00.000000
+
+GET /student-removal/requests?status=pending lists one admin's PENDING
+requests newest first. Only pending rows are indexed, so the index stays small
+however many processed requests accumulate.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "v4w5x6y7z8a9"
+down_revision = "u3v4w5x6y7z8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_student_removal_requests_pending",
+            "student_removal_requests",
+            ["admin_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_student_removal_requests_pending",
+            table_name="student_removal_requests",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
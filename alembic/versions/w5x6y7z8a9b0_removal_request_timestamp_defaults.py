@@ -0,0 +1,31 @@
+"""Server-side now() defaults for student_removal_requests timestamps
+
+Revision ID: w5x6y7z8a9b0
+Revises: v4w5x6y7z8a9
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "w5x6y7z8a9b0"
+down_revision = "v4w5x6y7z8a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN created_at SET DEFAULT now(), "
+        "ALTER COLUMN updated_at SET DEFAULT now()"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE student_removal_requests "
+        "ALTER COLUMN created_at DROP DEFAULT, "
+        "ALTER COLUMN updated_at DROP DEFAULT"
+    )
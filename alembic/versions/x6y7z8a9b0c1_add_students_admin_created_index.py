@@ -0,0 +1,41 @@
+"""Add (admin_id, created_at DESC, id DESC) index on students
+
+Revision ID: x6y7z8a9b0c1
+Revises: w5x6y7z8a9b0
+Create Date: 2026-10-16 13:00:00.000000
+
+GET /admin/students pages through one admin's students newest first with a
+(created_at, id) keyset cursor. With this index each page is an index range
+scan starting at the cursor instead of a sort plus OFFSET discard.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "x6y7z8a9b0c1"
+down_revision = "w5x6y7z8a9b0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_students_admin_created_id",
+            "students",
+            ["admin_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_students_admin_created_id",
+            table_name="students",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
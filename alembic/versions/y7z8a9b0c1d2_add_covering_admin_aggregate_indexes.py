@@ -0,0 +1,72 @@
+"""Add covering indexes for the admin stats / revenue aggregates
+
+Revision ID: y7z8a9b0c1d2
+Revises: x6y7z8a9b0c1
+Create Date: 2026-10-16 14:00:00.000000
+
+/admin/stats counts an admin's students by status, and the revenue views sum
+paid booking amounts over a payment_date range. With the aggregated columns in
+INCLUDE both can be answered by index-only scans instead of heap fetches.
+The covering seat_bookings index replaces ix_seat_booking_payment_status
+(same key columns), so only one of the two has to be maintained on writes.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "y7z8a9b0c1d2"
+down_revision = "x6y7z8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_students_admin_status_cover",
+            "students",
+            ["admin_id"],
+            unique=False,
+            postgresql_include=["status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_seat_booking_payment_cover",
+            "seat_bookings",
+            ["admin_id", "payment_status", "payment_date"],
+            unique=False,
+            postgresql_include=["amount"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_seat_booking_payment_status",
+            table_name="seat_bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_seat_booking_payment_status",
+            "seat_bookings",
+            ["admin_id", "payment_status", "payment_date"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_seat_booking_payment_cover",
+            table_name="seat_bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_students_admin_status_cover",
+            table_name="students",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
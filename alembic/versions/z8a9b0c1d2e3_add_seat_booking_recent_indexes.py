@@ -0,0 +1,58 @@
+"""Add seat_bookings (admin_id, created_at/updated_at DESC) indexes
+
+Revision ID: z8a9b0c1d2e3
+Revises: y7z8a9b0c1d2
+Create Date: 2026-10-16 15:00:00.000000
+
+GET /admin/recent-activities takes each admin's newest 50 bookings by
+created_at and by updated_at. The other feed sources (students, messages,
+attendance) already have an (admin_id, <timestamp>) index; these two give the
+booking branches the same top-N index scan instead of a sort. The updated_at
+branch only wants approved or rejected bookings, so that index is partial on
+exactly those rows and its scan never steps over pending or paid ones.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "z8a9b0c1d2e3"
+down_revision = "y7z8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+# (name, columns, partial-index predicate)
+INDEXES = (
+    ("ix_seat_booking_admin_created", ["admin_id", sa.text("created_at DESC")], None),
+    (
+        "ix_seat_booking_admin_decided",
+        ["admin_id", sa.text("updated_at DESC")],
+        sa.text("status IN ('approved', 'rejected')"),
+    ),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                "seat_bookings",
+                columns,
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="seat_bookings",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,24 +1,105 @@
-from fastapi import APIRouter
+import importlib
+import json
+from concurrent.futures import ThreadPoolExecutor
 
-from app.api.api_v1.endpoints import auth, admin, student, booking, messaging, referral, subscription, notifications, subscription_management, payments, student_removal, webhooks
+from fastapi import APIRouter, Response
 
-api_router = APIRouter()
+from app.api.routing import LazyAPIRoute, include_flat
+from app.core.migrations import MIGRATION_FAILED, MIGRATION_STATUSES, get_migration_status
+
+api_router = APIRouter(route_class=LazyAPIRoute)
+
+_ENDPOINTS_PACKAGE = "app.api.api_v1.endpoints"
+_IMPORT_WORKERS = 6
+# Imported by most endpoint modules; loaded up front before the parallel import
+_SHARED_IMPORTS = (
+    "app.models",
+    "app.schemas",
+    "app.auth.dependencies",
+    "app.core.cache",
+    "app.services.email_queue_service",
+    "app.services.notification_service",
+    "app.services.subscription_notification_service",
+    "app.services.qr_transfer_service",
+)
+
+# Pre-serialised /health bodies, one per migration status (the only varying field).
+# A failed background migration leaves the schema half-upgraded, so it reports
+# unhealthy with a 503 like a failed entrypoint migration would stop the container.
+_HEALTH_BODIES = {
+    status: json.dumps(
+        {
+            "status": "unhealthy" if status == MIGRATION_FAILED else "healthy",
+            "api_version": "v1",
+            "migration_status": status,
+        },
+        separators=(",", ":"),
+    ).encode()
+    for status in MIGRATION_STATUSES
+}
 
 # Health check endpoint for the API
-@api_router.get("/health")
+@api_router.get("/health", include_in_schema=False, response_class=Response)
 async def api_health_check():
-    return {"status": "healthy", "api_version": "v1"}
-
-# Include all endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
-api_router.include_router(student.router, prefix="/student", tags=["student"])
-api_router.include_router(booking.router, prefix="/booking", tags=["booking"])
-api_router.include_router(messaging.router, prefix="/messaging", tags=["messaging"])
-api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
-api_router.include_router(subscription_management.router, prefix="/subscription", tags=["subscription-management"])
-api_router.include_router(payments.router, prefix="/payment", tags=["payments"])
-api_router.include_router(student_removal.router, prefix="/student-removal", tags=["student-removal"])
-api_router.include_router(referral.router, prefix="/referral", tags=["referral"])
-api_router.include_router(subscription.router, prefix="/subscription", tags=["subscription"])
-api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+    migration_status = get_migration_status()
+    return Response(
+        content=_HEALTH_BODIES[migration_status],
+        status_code=503 if migration_status == MIGRATION_FAILED else 200,
+        media_type="application/json",
+    )
+
+
+def _mount(module_name: str, prefix: str, tags: list) -> None:
+    """Mount an endpoint module's router on api_router.
+
+    The module has already been imported by _import_endpoint_modules; this
+    only looks it up and copies its routes flat into api_router rather than
+    re-creating them through include_router (see app.api.routing).
+    """
+    module = importlib.import_module(f"{_ENDPOINTS_PACKAGE}.{module_name}")
+    include_flat(api_router, module.router, prefix=prefix, tags=tags)
+
+
+def _import_endpoint_modules(module_names) -> None:
+    """Import the endpoint modules concurrently.
+
+    The packages they all share are imported first, serially, so the worker
+    threads only contend on their own module locks and never on a shared,
+    half-initialised dependency. Mounting afterwards stays sequential and in
+    _MOUNTS order, which is what fixes route precedence.
+    """
+    for shared in _SHARED_IMPORTS:
+        importlib.import_module(shared)
+    with ThreadPoolExecutor(max_workers=_IMPORT_WORKERS) as executor:
+        # list() re-raises the first import error, if any
+        list(executor.map(
+            lambda name: importlib.import_module(f"{_ENDPOINTS_PACKAGE}.{name}"),
+            module_names,
+        ))
+
+
+# (module, prefix, tag) for every endpoint router mounted on api_router.
+# Routes are matched by a linear scan in this order, so the highest-traffic
+# areas (student app: dashboard, attendance, bookings, messages) come first.
+_MOUNTS = (
+    ("student", "/student", "student"),
+    ("booking", "/booking", "booking"),
+    ("messaging", "/messaging", "messaging"),
+    ("notifications", "/notifications", "notifications"),
+    ("admin", "/admin", "admin"),
+    ("auth", "/auth", "authentication"),
+    # Both share /subscription and are kept adjacent so their routes form one
+    # contiguous block; subscription_management is matched first, as before.
+    ("subscription_management", "/subscription", "subscription-management"),
+    ("subscription", "/subscription", "subscription"),
+    ("payments", "/payment", "payments"),
+    ("student_removal", "/student-removal", "student-removal"),
+    ("referral", "/referral", "referral"),
+    ("webhooks", "/webhooks", "webhooks"),
+)
+
+# Include all endpoint routers. This has to happen at import time: main.py copies
+# api_router's routes into the app when it includes it.
+_import_endpoint_modules(dict.fromkeys(name for name, _, _ in _MOUNTS))
+for _module_name, _prefix, _tag in _MOUNTS:
+    _mount(_module_name, _prefix, [_tag])
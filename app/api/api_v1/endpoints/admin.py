@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from sqlalchemy.orm import Session, aliased, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, String, and_, bindparam, cast, func, case, literal, literal_column, select, true, tuple_, union_all, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from typing import List
-from fastapi.responses import StreamingResponse, Response
-import io
-import openpyxl
-
-from app.database import get_db
-from app.auth.dependencies import get_current_admin
+from typing import List, Optional
+from fastapi.responses import Response
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+import re
+
+from app.api.routing import LazyAPIRoute
+from app.database import get_db, get_async_db
+from app.auth.dependencies import get_current_admin, get_current_admin_details
 from app.schemas.admin import (
     AdminDetailsCreate,
     AdminDetailsUpdate,
@@ -18,25 +21,30 @@ from app.schemas.admin import (
     AttendanceTrendDay,
     RevenueTrendMonth,
     AdminAttendanceRecord,
+    AdminTodayAttendanceItem,
     AdminRevenueItem,
     AdminActivityItem,
     AdminStudentAttendanceRecord,
-    StudentAttendanceRecordDetail,
     AdminStudentSubscriptionExtend,
 )
-from app.schemas.student import StudentResponse, StudentCreate, StudentUpdate, StudentTaskResponse
+from app.schemas.student import StudentResponse, StudentCreate, StudentUpdate, StudentTaskCreate, StudentTaskResponse
 from app.schemas.subscription import SubscriptionPlanResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import CursorPaginatedResponse, OffsetPaginatedResponse, PaginatedResponse
 from app.models.admin import AdminUser, AdminDetails
-from app.models.student import Student
+from app.models.student import Student, StudentAttendance, StudentMessage, StudentTask
 from app.models.booking import SeatBooking
 from app.models.subscription import SubscriptionPlan
-from app.auth.jwt import get_password_hash
+from app.auth.jwt import generate_url_token, get_password_hash
+from app.utils.attendance_filters import entry_on_day
+from app.utils.cursor import decode_cursor, encode_cursor
 from app.core.cache import (
     cached,
+    admin_stats_key,
     admin_dashboard_key,
     admin_attendance_trends_key,
     admin_revenue_trends_key,
+    admin_recent_activities_key,
+    admin_revenue_key,
     invalidate_student_dashboard,
     invalidate_admin_caches,
 )
@@ -59,7 +67,7 @@ from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 def _normalize_referral_code(value):
@@ -71,16 +79,62 @@ def _normalize_referral_code(value):
         return cleaned or None
     return value
 
+
+def _latest_attendance_per_student(db: Session, admin_user_id, *criteria):
+    """Aliased StudentAttendance holding each of the admin's students' latest
+    session matching ``criteria`` (DISTINCT ON student_id), for joining to Student."""
+
+    admin_students = db.query(Student.auth_user_id).filter(Student.admin_id == admin_user_id)
+    latest = (
+        db.query(StudentAttendance)
+        .filter(StudentAttendance.student_id.in_(admin_students), *criteria)
+        .distinct(StudentAttendance.student_id)
+        .order_by(StudentAttendance.student_id, StudentAttendance.entry_time.desc())
+        .subquery()
+    )
+    return aliased(StudentAttendance, latest)
+
+
+def _admin_has_student(db: Session, admin_user_id, student_id: str) -> bool:
+    """EXISTS check that ``student_id`` (Student.id) belongs to the admin."""
+    return db.query(
+        db.query(Student.id).filter(
+            Student.id == student_id,
+            Student.admin_id == admin_user_id,
+        ).exists()
+    ).scalar()
+
+
+def _count_rows(query) -> int:
+    """``SELECT count(*) FROM ... WHERE ...`` for an ORM query.
+
+    Query.count() wraps the full entity SELECT (ORDER BY included) in a
+    subquery; this counts straight off the query's FROM / WHERE instead.
+    """
+    return query.order_by(None).with_entities(func.count()).scalar()
+
+
+def _page_with_total(query, skip: int, limit: int):
+    """One page of ``query`` plus the total row count, in a single round trip.
+
+    The total rides along as ``count(*) OVER ()``; it is None when the page is
+    empty (no matches, or ``skip`` past the end).
+    """
+    rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+    return rows, (rows[0].total if rows else None)
+
 @router.post("/details", response_model=AdminDetailsResponse)
-async def create_admin_details(
+def create_admin_details(
     details: AdminDetailsCreate,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Create or update admin details"""
     # Check if details already exist
-    existing_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
-    if existing_details:
+    details_exist = db.query(
+        db.query(AdminDetails.id).filter(AdminDetails.user_id == current_admin.user_id).exists()
+    ).scalar()
+    if details_exist:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin details already exist"
@@ -110,7 +164,7 @@ async def create_admin_details(
     return admin_details
 
 @router.get("/details", response_model=AdminDetailsResponse)
-async def get_admin_details(
+def get_admin_details(
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
@@ -130,198 +184,119 @@ async def get_admin_details(
         db.commit()
         db.refresh(admin_details)
     
-    # Check if admin details are complete (not empty)
-    is_complete = (
-        admin_details.admin_name and 
-        admin_details.admin_name.strip() and
-        admin_details.library_name and 
-        admin_details.library_name.strip() and
-        admin_details.mobile_no and 
-        admin_details.mobile_no.strip() and
-        admin_details.address and 
-        admin_details.address.strip() and
-        admin_details.total_seats and 
-        admin_details.total_seats > 0
-    )
-    
-    # Check if bank details are complete
-    bank_details_complete = (
-        admin_details.bank_account_holder_name and 
-        admin_details.bank_account_holder_name.strip() and
-        admin_details.bank_account_number and 
-        admin_details.bank_account_number.strip() and
-        admin_details.bank_ifsc_code and 
-        admin_details.bank_ifsc_code.strip() and
-        admin_details.bank_name and 
-        admin_details.bank_name.strip() and
-        admin_details.bank_branch_name and 
-        admin_details.bank_branch_name.strip()
-    )
-    
-    # Create a proper response object with is_complete and bank_details_complete fields
-    return AdminDetailsResponse(
-        id=admin_details.id,
-        user_id=admin_details.user_id,
-        admin_name=admin_details.admin_name,
-        library_name=admin_details.library_name,
-        mobile_no=admin_details.mobile_no,
-        address=admin_details.address,
-        total_seats=admin_details.total_seats,
-        latitude=admin_details.latitude,
-        longitude=admin_details.longitude,
-        has_shift_system=admin_details.has_shift_system,
-        shift_timings=admin_details.shift_timings,
-        referral_code=admin_details.referral_code,
-        bank_account_holder_name=admin_details.bank_account_holder_name,
-        bank_account_number=admin_details.bank_account_number,
-        bank_ifsc_code=admin_details.bank_ifsc_code,
-        bank_name=admin_details.bank_name,
-        bank_branch_name=admin_details.bank_branch_name,
-        razorpay_linked_account_id=admin_details.razorpay_linked_account_id,
-        facility_images=admin_details.facility_images,
-        facility_description=admin_details.facility_description,
-        created_at=admin_details.created_at,
-        updated_at=admin_details.updated_at,
-        is_complete=is_complete,
-        bank_details_complete=bank_details_complete
-    )
+    return admin_details
 
 @router.put("/details", response_model=AdminDetailsResponse)
-async def update_admin_details(
+def update_admin_details(
     details: AdminDetailsUpdate,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Update admin details"""
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
+    update_data = details.model_dump(exclude_unset=True)
+    if "referral_code" in update_data:
+        update_data["referral_code"] = _normalize_referral_code(update_data.get("referral_code"))
+    if not update_data:
+        # Empty update (e.g. UI auto-save): nothing to write, just return the row
+        admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
+    else:
+        # One UPDATE ... RETURNING round trip instead of SELECT + UPDATE + refresh
+        stmt = (
+            update(AdminDetails)
+            .where(AdminDetails.user_id == current_admin.user_id)
+            .values(**update_data)
+            .returning(*AdminDetails.__table__.c)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            admin_details = db.execute(stmt).one_or_none()
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            if "admin_details_referral_code_key" in str(exc.orig):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Referral code already exists. Please use a different code."
+                ) from exc
+            raise
     if not admin_details:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Admin details not found"
         )
-    
-    update_data = details.model_dump(exclude_unset=True)
-    if "referral_code" in update_data:
-        update_data["referral_code"] = _normalize_referral_code(update_data.get("referral_code"))
-    for field, value in update_data.items():
-        setattr(admin_details, field, value)
-    
-    try:
-        db.commit()
-    except IntegrityError as exc:
-        db.rollback()
-        if "admin_details_referral_code_key" in str(exc.orig):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Referral code already exists. Please use a different code."
-            ) from exc
-        raise
-    db.refresh(admin_details)
-    
-    # Check if admin details are complete (not empty)
-    is_complete = (
-        admin_details.admin_name and 
-        admin_details.library_name and 
-        admin_details.mobile_no and 
-        admin_details.address and 
-        admin_details.total_seats > 0
+
+    return admin_details
+
+def _library_stats_stmt():
+    """All /stats figures in one round trip: each CTE is a single-row
+    aggregate, so the cross join yields exactly one row."""
+    admin_id = bindparam("admin_id")
+    student_stats = (
+        select(
+            func.count(Student.id).label("total_students"),
+            func.count(case((Student.status == "Present", 1))).label("present_students"),
+        )
+        .where(Student.admin_id == admin_id)
+        .cte("student_stats")
     )
-    
-    # Check if bank details are complete
-    bank_details_complete = (
-        admin_details.bank_account_holder_name and 
-        admin_details.bank_account_holder_name.strip() and
-        admin_details.bank_account_number and 
-        admin_details.bank_account_number.strip() and
-        admin_details.bank_ifsc_code and 
-        admin_details.bank_ifsc_code.strip() and
-        admin_details.bank_name and 
-        admin_details.bank_name.strip() and
-        admin_details.bank_branch_name and 
-        admin_details.bank_branch_name.strip()
+    booking_stats = (
+        select(
+            func.count(case((SeatBooking.status == "pending", 1))).label("pending_bookings"),
+            func.coalesce(
+                func.sum(case((SeatBooking.payment_status == "paid", SeatBooking.amount))), 0
+            ).label("total_revenue"),
+        )
+        .where(SeatBooking.admin_id == admin_id)
+        .cte("booking_stats")
     )
-    
-    # Create a proper response object with is_complete and bank_details_complete fields
-    return AdminDetailsResponse(
-        id=admin_details.id,
-        user_id=admin_details.user_id,
-        admin_name=admin_details.admin_name,
-        library_name=admin_details.library_name,
-        mobile_no=admin_details.mobile_no,
-        address=admin_details.address,
-        total_seats=admin_details.total_seats,
-        latitude=admin_details.latitude,
-        longitude=admin_details.longitude,
-        has_shift_system=admin_details.has_shift_system,
-        shift_timings=admin_details.shift_timings,
-        referral_code=admin_details.referral_code,
-        bank_account_holder_name=admin_details.bank_account_holder_name,
-        bank_account_number=admin_details.bank_account_number,
-        bank_ifsc_code=admin_details.bank_ifsc_code,
-        bank_name=admin_details.bank_name,
-        bank_branch_name=admin_details.bank_branch_name,
-        razorpay_linked_account_id=admin_details.razorpay_linked_account_id,
-        facility_images=admin_details.facility_images,
-        facility_description=admin_details.facility_description,
-        created_at=admin_details.created_at,
-        updated_at=admin_details.updated_at,
-        is_complete=is_complete,
-        bank_details_complete=bank_details_complete
+    total_seats_sq = (
+        select(AdminDetails.total_seats)
+        .where(AdminDetails.user_id == admin_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            student_stats.c.total_students,
+            student_stats.c.present_students,
+            booking_stats.c.pending_bookings,
+            booking_stats.c.total_revenue,
+            total_seats_sq.label("total_seats"),
+        )
+        .select_from(student_stats)
+        .join(booking_stats, true())
     )
 
+
+# Static-shape statements for hot read paths, built once with bind parameters
+# so requests skip statement construction and reuse the memoized cache key.
+_LIBRARY_STATS_STMT = _library_stats_stmt()
+_STUDENT_BY_ID_STMT = (
+    select(Student)
+    .options(raiseload("*"))
+    .where(Student.id == bindparam("student_id"), Student.admin_id == bindparam("admin_id"))
+)
+
+
 @router.get("/stats", response_model=LibraryStats)
+@cached(ttl=60, key_builder=lambda db, current_admin: admin_stats_key(str(current_admin.user_id)))
 async def get_library_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Get library statistics"""
-    def _safe_count(query, label: str) -> int:
-        try:
-            return int(query.count())
-        except SQLAlchemyError:
-            logger.exception("Failed stats count query for %s", label)
-            return 0
-
-    def _safe_scalar(query, label: str) -> float:
-        try:
-            value = query.scalar() or 0
-            return float(value)
-        except SQLAlchemyError:
-            logger.exception("Failed stats scalar query for %s", label)
-            return 0.0
-
-    # Keep dashboard operational even if one subquery breaks due to schema drift.
-    total_students = _safe_count(
-        db.query(Student).filter(Student.admin_id == current_admin.user_id),
-        "total_students",
-    )
-    present_students = _safe_count(
-        db.query(Student).filter(
-            Student.admin_id == current_admin.user_id,
-            Student.status == "Present",
-        ),
-        "present_students",
-    )
     try:
-        admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
+        row = (await db.execute(_LIBRARY_STATS_STMT, {"admin_id": current_admin.user_id})).one()
     except SQLAlchemyError:
-        logger.exception("Failed stats query for admin_details")
-        admin_details = None
-    total_seats = int(admin_details.total_seats or 0) if admin_details else 0
-    pending_bookings = _safe_count(
-        db.query(SeatBooking).filter(
-            SeatBooking.admin_id == current_admin.user_id,
-            SeatBooking.status == "pending",
-        ),
-        "pending_bookings",
-    )
-    total_revenue = _safe_scalar(
-        db.query(func.sum(SeatBooking.amount)).filter(
-            SeatBooking.admin_id == current_admin.user_id,
-            SeatBooking.payment_status == "paid",
-        ),
-        "total_revenue",
-    )
+        # Keep the dashboard operational (zeros) even if the query breaks due to schema drift.
+        logger.exception("Failed library stats query")
+        row = None
+
+    total_students = int(row.total_students or 0) if row else 0
+    present_students = int(row.present_students or 0) if row else 0
+    total_seats = int(row.total_seats or 0) if row else 0
+    pending_bookings = int(row.pending_bookings or 0) if row else 0
+    total_revenue = float(row.total_revenue or 0) if row else 0.0
 
     return LibraryStats(
         total_students=total_students,
@@ -333,16 +308,19 @@ async def get_library_stats(
     )
 
 @router.post("/students", response_model=StudentResponse)
-async def create_student(
+def create_student(
     student_data: StudentCreate,
     request: Request,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminUser = Depends(get_current_admin),
+    admin_details: Optional[AdminDetails] = Depends(get_current_admin_details),
 ):
     """Create a new student and send login credentials email"""
     # Check if student already exists
     try:
-        existing_student = db.query(Student).filter(Student.email == student_data.email.lower()).first()
+        existing_student = db.query(
+            db.query(Student.id).filter(Student.email == student_data.email.lower()).exists()
+        ).scalar()
     except SQLAlchemyError:
         logger.exception("DB error checking existing student")
         raise HTTPException(
@@ -358,16 +336,17 @@ async def create_student(
     # Generate student ID
     from app.services.student_service import generate_student_id
     try:
-        student_id = await generate_student_id(current_admin.user_id, db)
+        student_id = generate_student_id(current_admin.user_id, db, admin_details)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin profile is incomplete. Please save admin details before adding students."
         ) from exc
+    # Read before the commits below expire the row; only the name goes in the email payload.
+    library_name = admin_details.library_name or "your library"
     
     # Generate password setup token for email
-    import uuid
-    password_setup_token = str(uuid.uuid4())
+    password_setup_token, password_setup_token_hash = generate_url_token()
     
     # Create student
     hashed_password = get_password_hash(student_data.password)
@@ -375,7 +354,7 @@ async def create_student(
         student_id=student_id,
         admin_id=current_admin.user_id,
         hashed_password=hashed_password,
-        password_reset_token=password_setup_token,
+        password_reset_token=password_setup_token_hash,
         **student_data.model_dump(exclude={"password", "admin_id"})
     )
     
@@ -406,9 +385,6 @@ async def create_student(
         db.rollback()
         logger.exception("Student created but seat auto-assignment/cache invalidation failed")
     
-    from app.models.admin import AdminDetails
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
-    library_name = admin_details.library_name if admin_details else "your library"
     try:
         enqueue_email_job(
             db=db,
@@ -430,24 +406,58 @@ async def create_student(
 
 @router.get(
     "/students",
-    response_model=PaginatedResponse[StudentResponse],
+    response_model=CursorPaginatedResponse[StudentResponse],
     summary="List students (paginated)",
 )
-async def get_students(
+def get_students(
     skip: int = 0,
     limit: int = 20,
     order: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
-    """Get paginated list of students for the current admin. Use skip/limit for pagination (max page_size 100)."""
+    """Get paginated list of students for the current admin (max page_size 100).
+
+    Newest-first listings (no ``order`` or ``order=created_at:desc``) return a
+    ``next_cursor``; pass it back as ``cursor`` for constant-cost deep pages.
+    skip/limit still works for every order, but ``skip`` cannot be combined
+    with ``cursor``. A cursor page's position is not known, so it always
+    reports ``page`` 1.
+    """
     limit = min(max(1, limit), 100)
+    keyset = order in (None, "created_at:desc")
+    after = None
+    if cursor is not None:
+        if not keyset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor is only supported for order=created_at:desc",
+            )
+        if skip > 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="skip cannot be combined with cursor",
+            )
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
     try:
-        base_query = db.query(Student).filter(Student.admin_id == current_admin.user_id)
-        total = base_query.count()
+        # StudentResponse reads columns only; raiseload turns any future
+        # relationship access during serialization into an error, not N+1 SELECTs.
+        base_query = (
+            db.query(Student)
+            .options(raiseload("*"))
+            .filter(Student.admin_id == current_admin.user_id)
+        )
+        total = _count_rows(base_query)
 
-        if order == "created_at:desc":
-            base_query = base_query.order_by(Student.created_at.desc())
+        if keyset:
+            # (created_at, id) keyset: served by ix_students_admin_created_id
+            base_query = base_query.order_by(Student.created_at.desc(), Student.id.desc())
+            if after is not None:
+                base_query = base_query.filter(tuple_(Student.created_at, Student.id) < after)
         elif order == "created_at:asc":
             base_query = base_query.order_by(Student.created_at.asc())
         elif order == "name:asc":
@@ -457,46 +467,59 @@ async def get_students(
 
         students = base_query.offset(skip).limit(limit).all()
         page = (skip // limit) + 1 if limit else 1
-        return PaginatedResponse(
+        next_cursor = None
+        if keyset and len(students) == limit and students[-1].created_at is not None:
+            next_cursor = encode_cursor(students[-1].created_at, students[-1].id)
+        return CursorPaginatedResponse(
             items=students,
             total=total,
             page=page,
             page_size=limit,
+            next_cursor=next_cursor,
         )
     except Exception as e:
         logger.exception("Error in get_students")
-        return PaginatedResponse(items=[], total=0, page=1, page_size=limit)
+        return CursorPaginatedResponse(items=[], total=0, page=1, page_size=limit)
+
+STUDENT_TEMPLATE_CSV = b"""Name*,Email*,Mobile Number*,Address*,Subscription Start (YYYY-MM-DD)*,Subscription End (YYYY-MM-DD)*,Is Shift Student (true/false)*,Shift Time (HH:mm - HH:mm)
+Sandeep Kumar,sandeep@example.com,1234567890,123 Main St,2025-03-01,2025-06-01,false,
+Anshul Kumar,anshul@example.com,0987654321,456 Oak Ave,2025-03-01,2025-06-01,true,2:00 PM - 6:00 PM"""
+STUDENT_TEMPLATE_ETAG = f'"{hashlib.sha256(STUDENT_TEMPLATE_CSV).hexdigest()[:32]}"'
+# The template only changes with a deploy; "private" because the route needs auth
+_STUDENT_TEMPLATE_CACHE_HEADERS = {
+    "ETag": STUDENT_TEMPLATE_ETAG,
+    "Cache-Control": "private, max-age=86400",
+}
 
 # Important: This specific route must come BEFORE the dynamic route with {student_id}
 @router.get("/students/template")
 def download_student_template(
+    request: Request,
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Download CSV template for bulk student upload"""
-    csv_content = """Name*,Email*,Mobile Number*,Address*,Subscription Start (YYYY-MM-DD)*,Subscription End (YYYY-MM-DD)*,Is Shift Student (true/false)*,Shift Time (HH:mm - HH:mm)
-Sandeep Kumar,sandeep@example.com,1234567890,123 Main St,2025-03-01,2025-06-01,false,
-Anshul Kumar,anshul@example.com,0987654321,456 Oak Ave,2025-03-01,2025-06-01,true,2:00 PM - 6:00 PM"""
-    
+    if request.headers.get("if-none-match") == STUDENT_TEMPLATE_ETAG:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_STUDENT_TEMPLATE_CACHE_HEADERS)
     return Response(
-        content=csv_content,
+        content=STUDENT_TEMPLATE_CSV,
         media_type="text/csv",
         headers={
             "Content-Disposition": "attachment; filename=student_template.csv",
-            "Access-Control-Expose-Headers": "Content-Disposition"
+            "Access-Control-Expose-Headers": "Content-Disposition, ETag",
+            **_STUDENT_TEMPLATE_CACHE_HEADERS,
         },
     )
 
 @router.get("/students/{student_id}", response_model=StudentResponse)
-async def get_student(
+def get_student(
     student_id: str,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Get a specific student"""
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.admin_id == current_admin.user_id
-    ).first()
+    student = db.execute(
+        _STUDENT_BY_ID_STMT, {"student_id": student_id, "admin_id": current_admin.user_id}
+    ).scalars().first()
     
     if not student:
         raise HTTPException(
@@ -507,43 +530,49 @@ async def get_student(
     return student
 
 @router.put("/students/{student_id}", response_model=StudentResponse)
-async def update_student(
+def update_student(
     student_id: str,
     student_data: StudentUpdate,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Update a student"""
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.admin_id == current_admin.user_id
-    ).first()
-    
+    student_filter = (Student.id == student_id, Student.admin_id == current_admin.user_id)
+    update_data = student_data.model_dump(exclude_unset=True)
+    if not update_data:
+        # Empty update: skip the UPDATE, COMMIT and cache invalidation
+        student = db.query(Student).options(raiseload("*")).filter(*student_filter).first()
+    else:
+        # One UPDATE ... RETURNING round trip instead of SELECT + UPDATE + refresh
+        student = db.execute(
+            update(Student)
+            .where(*student_filter)
+            .values(**update_data)
+            .returning(*Student.__table__.c)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if student:
+            db.commit()
+            invalidate_admin_caches(str(current_admin.user_id))
+
     if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
-    
-    update_data = student_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(student, field, value)
-    
-    db.commit()
-    db.refresh(student)
 
     return student
 
 
 @router.post("/students/{student_id}/extend-subscription")
-async def extend_student_subscription_admin(
+def extend_student_subscription_admin(
     student_id: str,
     body: AdminStudentSubscriptionExtend,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
+    library: Optional[AdminDetails] = Depends(get_current_admin_details),
 ):
     """Extend subscription after cash (or manual) payment; amount is recorded as paid SeatBooking revenue."""
-    from decimal import Decimal
     from app.services.subscription_cash_revenue_service import apply_cash_subscription_extension
 
     student = (
@@ -554,11 +583,6 @@ async def extend_student_subscription_admin(
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
-    library = (
-        db.query(AdminDetails)
-        .filter(AdminDetails.user_id == current_admin.user_id)
-        .first()
-    )
     if not library:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Library details not found")
 
@@ -588,7 +612,7 @@ async def extend_student_subscription_admin(
 
 
 @router.delete("/students/{student_id}")
-async def delete_student(
+def delete_student(
     student_id: str,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
@@ -608,6 +632,7 @@ async def delete_student(
     # Soft delete by setting status to inactive
     student.status = "inactive"
     db.commit()
+    invalidate_admin_caches(str(current_admin.user_id))
 
     return {"message": "Student deleted successfully"}
 
@@ -616,7 +641,7 @@ async def delete_student(
     response_model=PaginatedResponse[AdminStudentAttendanceRecord],
     summary="List student attendance (paginated)",
 )
-async def get_student_attendance(
+def get_student_attendance(
     student_id: str,
     skip: int = 0,
     limit: int = 50,
@@ -624,88 +649,109 @@ async def get_student_attendance(
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get paginated attendance records for a specific student."""
-    from app.models.student import StudentAttendance
 
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.admin_id == current_admin.user_id,
-    ).first()
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found",
+    # Ownership is part of the join, so the common case is a single query;
+    # only an empty page needs the separate 404 / count checks. Columns are
+    # projected under the AdminStudentAttendanceRecord field names (nested
+    # student object built by Postgres), so rows validate into the schema as-is.
+    base = (
+        db.query(
+            cast(StudentAttendance.id, String).label("id"),
+            Student.student_id,
+            Student.name.label("student_name"),
+            Student.email,
+            StudentAttendance.entry_time,
+            StudentAttendance.exit_time,
+            StudentAttendance.total_duration,
+            StudentAttendance.latitude,
+            StudentAttendance.longitude,
+            StudentAttendance.created_at,
+            func.jsonb_build_object(
+                "student_id", Student.student_id,
+                "name", Student.name,
+                "email", Student.email,
+            ).label("student"),
         )
-
-    base = db.query(StudentAttendance).filter(
-        StudentAttendance.student_id == student.auth_user_id
-    ).order_by(StudentAttendance.entry_time.desc())
-    total = base.count()
+        .select_from(StudentAttendance)
+        .join(Student, Student.auth_user_id == StudentAttendance.student_id)
+        .filter(
+            Student.id == student_id,
+            Student.admin_id == current_admin.user_id,
+        )
+        .order_by(StudentAttendance.entry_time.desc())
+    )
     limit = min(max(1, limit), 100)
-    records = base.offset(skip).limit(limit).all()
+    rows, total = _page_with_total(base, skip, limit)
+    if total is None:
+        if not _admin_has_student(db, current_admin.user_id, student_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Student not found",
+            )
+        total = _count_rows(base) if skip else 0
 
-    items = [
-        AdminStudentAttendanceRecord(
-            id=str(r.id),
-            student_id=student.student_id,
-            student_name=student.name,
-            email=student.email,
-            entry_time=r.entry_time,
-            exit_time=r.exit_time,
-            total_duration=str(r.total_duration) if r.total_duration else None,
-            latitude=r.latitude,
-            longitude=r.longitude,
-            created_at=r.created_at,
-            student=StudentAttendanceRecordDetail(
-                student_id=student.student_id,
-                name=student.name,
-                email=student.email,
-            ),
-        )
-        for r in records
-    ]
+    items = [AdminStudentAttendanceRecord.model_validate(row) for row in rows]
     page = (skip // limit) + 1 if limit else 1
     return PaginatedResponse(items=items, total=total, page=page, page_size=limit)
 
-@router.get("/attendance/today")
-async def get_today_attendance(
+@router.get(
+    "/attendance/today",
+    response_model=OffsetPaginatedResponse[AdminTodayAttendanceItem],
+    summary="Today's attendance for all students (paginated)",
+)
+def get_today_attendance(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    """Get today's attendance for all students"""
-    from app.models.student import StudentAttendance
-    from datetime import date
+    """Get today's attendance for the admin's students, ordered by student ID."""
 
     today = date.today()
 
-    # Get all students for this admin
-    students = db.query(Student).filter(Student.admin_id == current_admin.user_id).all()
-
-    attendance_data = []
-    for student in students:
-        # Check if student has attendance record for today
-        attendance = db.query(StudentAttendance).filter(
-            StudentAttendance.student_id == student.auth_user_id,
-            func.date(StudentAttendance.entry_time) == today
-        ).first()
-
-        attendance_data.append({
-            "student_id": str(student.id),
-            "student_name": student.name,
-            "auth_user_id": str(student.auth_user_id),
-            "status": "Present" if attendance and not attendance.exit_time else "Absent",
-            "entry_time": attendance.entry_time if attendance else None,
-            "exit_time": attendance.exit_time if attendance else None,
-            "total_duration": str(attendance.total_duration) if attendance and attendance.total_duration else None
-        })
-
-    return attendance_data
+    # All students for this admin with today's attendance (if any) in one query
+    attendance_today = _latest_attendance_per_student(
+        db, current_admin.user_id, entry_on_day(today)
+    )
+    base = (
+        db.query(
+            cast(Student.id, String).label("student_id"),
+            Student.name.label("student_name"),
+            cast(Student.auth_user_id, String).label("auth_user_id"),
+            case(
+                (
+                    and_(attendance_today.id.isnot(None), attendance_today.exit_time.is_(None)),
+                    "Present",
+                ),
+                else_="Absent",
+            ).label("status"),
+            attendance_today.entry_time,
+            attendance_today.exit_time,
+            attendance_today.total_duration,
+        )
+        .outerjoin(attendance_today, attendance_today.student_id == Student.auth_user_id)
+        .filter(Student.admin_id == current_admin.user_id)
+        .order_by(Student.student_id)
+    )
+    rows, total = _page_with_total(base, skip, limit)
+    if total is None:
+        total = _count_rows(base) if skip else 0
+
+    items = [AdminTodayAttendanceItem.model_validate(row) for row in rows]
+    return OffsetPaginatedResponse(
+        items=items,
+        total=total,
+        page=(skip // limit) + 1,
+        page_size=limit,
+        has_more=skip + len(items) < total,
+    )
 
 @router.get(
     "/students/{student_id}/tasks",
     response_model=PaginatedResponse[StudentTaskResponse],
     summary="List student tasks (paginated)",
 )
-async def get_student_tasks(
+def get_student_tasks(
     student_id: str,
     skip: int = 0,
     limit: int = 50,
@@ -713,39 +759,41 @@ async def get_student_tasks(
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get paginated tasks for a specific student."""
-    from app.models.student import StudentTask
 
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.admin_id == current_admin.user_id,
-    ).first()
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found",
+    base = (
+        db.query(StudentTask)
+        .options(raiseload("*"))
+        .join(Student, Student.id == StudentTask.student_id)
+        .filter(
+            Student.id == student_id,
+            Student.admin_id == current_admin.user_id,
         )
-
-    base = db.query(StudentTask).filter(StudentTask.student_id == student.id).order_by(
-        StudentTask.created_at.desc()
+        .order_by(StudentTask.created_at.desc())
     )
-    total = base.count()
     limit = min(max(1, limit), 100)
-    tasks = base.offset(skip).limit(limit).all()
+    rows, total = _page_with_total(base, skip, limit)
+    if total is None:
+        if not _admin_has_student(db, current_admin.user_id, student_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Student not found",
+            )
+        total = _count_rows(base) if skip else 0
+    tasks = [row.StudentTask for row in rows]
     page = (skip // limit) + 1 if limit else 1
     return PaginatedResponse(items=tasks, total=total, page=page, page_size=limit)
 
-@router.post("/students/{student_id}/tasks")
-async def create_student_task(
+@router.post("/students/{student_id}/tasks", response_model=StudentTaskResponse)
+def create_student_task(
     student_id: str,
-    task_data: dict,
+    task_data: StudentTaskCreate,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Create a task for a specific student"""
-    from app.models.student import StudentTask
 
-    # Verify student belongs to current admin
-    student = db.query(Student).filter(
+    # Verify student belongs to current admin (only the keys used below)
+    student = db.query(Student.id, Student.auth_user_id).filter(
         Student.id == student_id,
         Student.admin_id == current_admin.user_id
     ).first()
@@ -758,7 +806,7 @@ async def create_student_task(
 
     task = StudentTask(
         student_id=student.id,
-        **task_data
+        **task_data.model_dump()
     )
 
     db.add(task)
@@ -773,94 +821,89 @@ async def create_student_task(
     response_model=DashboardStats,
     summary="Dashboard analytics (cached)",
 )
-@cached(ttl=60, key_builder=lambda db, current_admin: admin_dashboard_key(str(current_admin.user_id)))
+@cached(ttl=30, key_builder=lambda db, current_admin: admin_dashboard_key(str(current_admin.user_id)))
 async def get_dashboard_analytics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get comprehensive dashboard analytics. Stable response shape for frontend caching."""
-    from app.models.student import StudentAttendance, StudentMessage
-    from datetime import datetime, timedelta
 
     try:
-        today = datetime.utcnow().date()
-        current_month_start = datetime.utcnow().replace(
+        # tz-aware UTC: asyncpg reads naive datetimes as the server's local time
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        current_month_start = now.replace(
             day=1, hour=0, minute=0, second=0, microsecond=0
         )
         last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+        admin_user_id = current_admin.user_id
 
-        result = (
-            db.query(
-                func.count(Student.id).label("total_students"),
-                func.count(
-                    case(
-                        (func.date(StudentAttendance.entry_time) == today, 1),
-                        else_=None,
-                    )
-                ).label("present_students"),
-                func.sum(
-                    case(
-                        (
-                            (SeatBooking.payment_status == "paid")
-                            & (SeatBooking.admin_id == current_admin.user_id),
-                            SeatBooking.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("total_revenue"),
-                func.sum(
-                    case(
-                        (
-                            (SeatBooking.payment_status == "paid")
-                            & (SeatBooking.payment_date >= current_month_start)
-                            & (SeatBooking.admin_id == current_admin.user_id),
-                            SeatBooking.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("monthly_revenue"),
-                func.sum(
-                    case(
-                        (
-                            (SeatBooking.payment_status == "paid")
-                            & (SeatBooking.payment_date >= last_month_start)
-                            & (SeatBooking.payment_date < current_month_start)
-                            & (SeatBooking.admin_id == current_admin.user_id),
-                            SeatBooking.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("last_month_revenue"),
-                func.count(
-                    case(
-                        (
-                            (SeatBooking.status == "pending")
-                            & (SeatBooking.admin_id == current_admin.user_id),
-                            1,
-                        ),
-                        else_=None,
-                    )
-                ).label("pending_bookings"),
+        # One round trip: single-row aggregates per table, cross joined.
+        student_stats = (
+            select(func.count(Student.id).label("total_students"))
+            .where(Student.admin_id == admin_user_id)
+            .cte("student_stats")
+        )
+        # Students currently checked in today (open attendance session)
+        attendance_stats = (
+            select(func.count(func.distinct(StudentAttendance.student_id)).label("present_students"))
+            .where(
+                StudentAttendance.admin_id == admin_user_id,
+                entry_on_day(today),
+                StudentAttendance.exit_time.is_(None),
             )
-            .outerjoin(
-                StudentAttendance,
-                (StudentAttendance.student_id == Student.id)
-                & (func.date(StudentAttendance.entry_time) == today)
-                & (StudentAttendance.exit_time.is_(None)),
+            .cte("attendance_stats")
+        )
+        paid = SeatBooking.payment_status == "paid"
+        booking_stats = (
+            select(
+                func.count(SeatBooking.id).filter(SeatBooking.status == "pending").label("pending_bookings"),
+                func.sum(SeatBooking.amount).filter(paid).label("total_revenue"),
+                func.sum(SeatBooking.amount)
+                .filter(paid, SeatBooking.payment_date >= current_month_start)
+                .label("monthly_revenue"),
+                func.sum(SeatBooking.amount)
+                .filter(
+                    paid,
+                    SeatBooking.payment_date >= last_month_start,
+                    SeatBooking.payment_date < current_month_start,
+                )
+                .label("last_month_revenue"),
             )
-            .outerjoin(
-                SeatBooking,
-                SeatBooking.admin_id == current_admin.user_id,
+            .where(SeatBooking.admin_id == admin_user_id)
+            .cte("booking_stats")
+        )
+        message_stats = (
+            select(func.count(StudentMessage.id).label("recent_messages"))
+            .where(
+                StudentMessage.admin_id == admin_user_id,
+                StudentMessage.created_at >= now - timedelta(days=7),
             )
-            .filter(Student.admin_id == current_admin.user_id)
-            .first()
+            .cte("message_stats")
         )
-
-        admin_details = (
-            db.query(AdminDetails)
-            .filter(AdminDetails.user_id == current_admin.user_id)
-            .first()
+        total_seats_sq = (
+            select(AdminDetails.total_seats)
+            .where(AdminDetails.user_id == admin_user_id)
+            .limit(1)
+            .scalar_subquery()
         )
+        stmt = (
+            select(
+                student_stats.c.total_students,
+                attendance_stats.c.present_students,
+                booking_stats.c.pending_bookings,
+                booking_stats.c.total_revenue,
+                booking_stats.c.monthly_revenue,
+                booking_stats.c.last_month_revenue,
+                message_stats.c.recent_messages,
+                total_seats_sq.label("total_seats"),
+            )
+            .select_from(student_stats)
+            .join(attendance_stats, true())
+            .join(booking_stats, true())
+            .join(message_stats, true())
+        )
+        result = (await db.execute(stmt)).one()
 
         monthly_revenue = float(result.monthly_revenue or 0)
         last_month_revenue = float(result.last_month_revenue or 0)
@@ -870,18 +913,10 @@ async def get_dashboard_analytics(
                 (monthly_revenue - last_month_revenue) / last_month_revenue
             ) * 100
 
-        recent_messages = (
-            db.query(StudentMessage)
-            .filter(
-                StudentMessage.admin_id == current_admin.user_id,
-                StudentMessage.created_at >= datetime.utcnow() - timedelta(days=7),
-            )
-            .count()
-        )
-
+        recent_messages = result.recent_messages or 0
         total_students = result.total_students or 0
         present_students = result.present_students or 0
-        total_seats = admin_details.total_seats if admin_details else 0
+        total_seats = result.total_seats or 0
 
         return DashboardStats(
             library_stats=LibraryStats(
@@ -919,97 +954,122 @@ async def get_dashboard_analytics(
 )
 @cached(ttl=60, key_builder=lambda days, db, current_admin: admin_attendance_trends_key(str(current_admin.user_id), days))
 async def get_attendance_trends(
-    days: int = 30,
-    db: Session = Depends(get_db),
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get attendance trends for the last N days. Stable response shape: list of {date, count}."""
-    from app.models.student import StudentAttendance
-    from datetime import datetime, timedelta
 
     end_date = datetime.utcnow().date()
     start_date = end_date - timedelta(days=days)
-    attendance_data: List[AttendanceTrendDay] = []
-    current_date = start_date
 
-    while current_date <= end_date:
-        daily_count = db.query(StudentAttendance).filter(
+    # Per-day counts left-joined onto a generate_series of the window, so days
+    # without entries come back as 0 and the rows arrive already in date order.
+    entry_day = func.date(StudentAttendance.entry_time)
+    counts = (
+        select(entry_day.label("day"), func.count(StudentAttendance.id).label("entries"))
+        .where(
             StudentAttendance.admin_id == current_admin.user_id,
-            func.date(StudentAttendance.entry_time) == current_date,
-        ).count()
-        attendance_data.append(
-            AttendanceTrendDay(date=current_date.isoformat(), count=daily_count)
+            StudentAttendance.entry_time >= datetime.combine(
+                start_date, datetime.min.time(), tzinfo=timezone.utc
+            ),
         )
-        current_date += timedelta(days=1)
+        .group_by(entry_day)
+        .subquery("counts")
+    )
+    # Typed bounds: asyncpg would otherwise infer timestamptz params and reject dates.
+    series = func.generate_series(
+        cast(start_date, Date), cast(end_date, Date), literal_column("interval '1 day'")
+    ).table_valued("d").alias("series")
+    series_day = cast(series.c.d, Date)
+    stmt = (
+        select(series_day.label("day"), func.coalesce(counts.c.entries, 0).label("entries"))
+        .select_from(series.outerjoin(counts, counts.c.day == series_day))
+        .order_by(series.c.d)
+    )
+    rows = (await db.execute(stmt)).all()
 
-    return attendance_data
+    return [AttendanceTrendDay(date=row.day.isoformat(), count=row.entries) for row in rows]
 
 @router.get(
     "/analytics/revenue-trends",
     response_model=List[RevenueTrendMonth],
     summary="Revenue trends by month (cached)",
 )
-@cached(ttl=60, key_builder=lambda months, db, current_admin: admin_revenue_trends_key(str(current_admin.user_id), months))
+@cached(ttl=600, key_builder=lambda months, db, current_admin: admin_revenue_trends_key(str(current_admin.user_id), months))
 async def get_revenue_trends(
-    months: int = 12,
-    db: Session = Depends(get_db),
+    months: int = Query(12, ge=1, le=36),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get revenue trends for the last N months. Stable response shape: list of {month, revenue}."""
-    from datetime import datetime, timedelta
-    import calendar
 
-    revenue_data: List[RevenueTrendMonth] = []
-    current_date = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    for i in range(months):
-        month_start = current_date - timedelta(days=30 * i)
-        month_start = month_start.replace(day=1)
-        last_day = calendar.monthrange(month_start.year, month_start.month)[1]
-        month_end = month_start.replace(day=last_day, hour=23, minute=59, second=59)
-
-        monthly_revenue = db.query(SeatBooking).filter(
+    current_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    # Month starts oldest -> newest, stepping by calendar month
+    month_starts = []
+    for i in range(months - 1, -1, -1):
+        year, month = divmod(current_month.year * 12 + current_month.month - 1 - i, 12)
+        month_starts.append(current_month.replace(year=year, month=month + 1))
+    if not month_starts:
+        return []
+
+    # One grouped query for the whole window; months without payments are filled with 0 below.
+    # Literal (not bound) arguments keep the SELECT and GROUP BY expressions identical
+    payment_month = func.to_char(
+        func.date_trunc(literal_column("'month'"), SeatBooking.payment_date),
+        literal_column("'YYYY-MM'"),
+    )
+    stmt = (
+        select(payment_month.label("month"), func.sum(SeatBooking.amount).label("revenue"))
+        .where(
             SeatBooking.admin_id == current_admin.user_id,
             SeatBooking.payment_status == "paid",
-            SeatBooking.payment_date >= month_start,
-            SeatBooking.payment_date <= month_end,
-        ).with_entities(func.sum(SeatBooking.amount)).scalar() or 0
-
-        revenue_data.append(
-            RevenueTrendMonth(month=month_start.strftime("%Y-%m"), revenue=float(monthly_revenue))
+            SeatBooking.payment_date >= month_starts[0],
         )
+        .group_by(payment_month)
+    )
+    rows = (await db.execute(stmt)).all()
+    revenue_by_month = {row.month: row.revenue for row in rows}
 
-    return list(reversed(revenue_data))
+    return [
+        RevenueTrendMonth(
+            month=month_start.strftime("%Y-%m"),
+            revenue=float(revenue_by_month.get(month_start.strftime("%Y-%m")) or 0),
+        )
+        for month_start in month_starts
+    ]
 
 @router.get(
     "/subscription-plans",
     response_model=PaginatedResponse[SubscriptionPlanResponse],
     summary="List subscription plans (paginated)",
 )
-async def get_admin_subscription_plans(
+def get_admin_subscription_plans(
     skip: int = 0,
     limit: int = 50,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get paginated subscription plans for the current admin's library."""
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
-    if not admin_details:
+    library_id = (
+        db.query(AdminDetails.id).filter(AdminDetails.user_id == current_admin.user_id).scalar()
+    )
+    if not library_id:
         raise HTTPException(status_code=404, detail="Admin details not found")
     # Keep list consistent with soft-delete behavior in subscription endpoints.
     # Deleted plans are marked is_active=False, so exclude them from admin listing.
     base = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.library_id == admin_details.id,
+        SubscriptionPlan.library_id == library_id,
         SubscriptionPlan.is_active == True,
     )
-    total = base.count()
+    total = _count_rows(base)
     limit = min(max(1, limit), 100)
     plans = base.offset(skip).limit(limit).all()
     page = (skip // limit) + 1 if limit else 1
     return PaginatedResponse(items=plans, total=total, page=page, page_size=limit)
 
 @router.post("/test-email")
-async def test_email(
+def test_email(
     request: dict,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
@@ -1050,7 +1110,7 @@ async def test_email(
     response_model=PaginatedResponse[AdminAttendanceRecord],
     summary="List attendance for a date (paginated)",
 )
-async def get_admin_attendance(
+def get_admin_attendance(
     date: str = None,
     skip: int = 0,
     limit: int = 50,
@@ -1067,8 +1127,6 @@ async def get_admin_attendance(
     - The query uses an IST-offset window so late-night IST check-ins (which cross
       UTC midnight) are attributed to the correct IST calendar day.
     """
-    from app.models.student import StudentAttendance
-    from datetime import datetime, timedelta, timezone
 
     if date:
         try:
@@ -1080,8 +1138,8 @@ async def get_admin_attendance(
             )
     else:
         # Use local server date (IST on this machine), not UTC
-        from datetime import date as _date
-        target_date = _date.today()
+        # (the ``date`` query parameter shadows datetime.date here)
+        target_date = datetime.now().date()
 
     # IST is UTC+5:30.  Convert the selected calendar day (IST midnight) to UTC
     # so that the DB comparison is timezone-correct even though entry_time is
@@ -1101,36 +1159,55 @@ async def get_admin_attendance(
     day_start_utc = day_start_ist.astimezone(timezone.utc).replace(tzinfo=None)
     day_end_utc   = day_end_ist.astimezone(timezone.utc).replace(tzinfo=None)
 
-    students = db.query(Student).filter(Student.admin_id == current_admin.user_id).all()
-    all_records: List[AdminAttendanceRecord] = []
-
-    for student in students:
-        # Show this student ONLY if they checked IN during the selected IST calendar day.
-        # Checkout can be any time (next day is fine) — the record still belongs to
-        # the check-in date. No cross-day fallback.
-        attendance = (
-            db.query(StudentAttendance)
-            .filter(
-                StudentAttendance.student_id == student.auth_user_id,
-                StudentAttendance.entry_time >= day_start_utc,
-                StudentAttendance.entry_time <  day_end_utc,
-            )
-            .order_by(StudentAttendance.entry_time.desc())
-            .first()
+    # Show a student ONLY if they checked IN during the selected IST calendar day
+    # (latest such check-in). Checkout can be any time (next day is fine) — the
+    # record still belongs to the check-in date. No cross-day fallback. The inner
+    # join drops students with no check-in on this date.
+    attendance_on_day = _latest_attendance_per_student(
+        db,
+        current_admin.user_id,
+        StudentAttendance.entry_time >= day_start_utc,
+        StudentAttendance.entry_time < day_end_utc,
+    )
+    # Only the columns the record needs, as plain rows (no ORM objects); the
+    # database sorts by student ID and pages, with the total as a window count.
+    base = (
+        db.query(
+            Student.id,
+            Student.student_id,
+            Student.name,
+            Student.email,
+            Student.mobile_no,
+            attendance_on_day.entry_time,
+            attendance_on_day.exit_time,
+            attendance_on_day.total_duration,
+            # "Present" = still inside, "Completed" = checked out
+            case(
+                (attendance_on_day.exit_time.is_(None), "Present"), else_="Completed"
+            ).label("status"),
         )
+        .join(attendance_on_day, attendance_on_day.student_id == Student.auth_user_id)
+        .filter(Student.admin_id == current_admin.user_id)
+        .order_by(Student.student_id)
+    )
+    limit = min(max(1, limit), 100)
+    rows, total = _page_with_total(base, skip, limit)
+    if total is None:
+        total = _count_rows(base) if skip else 0
+
+    items: List[AdminAttendanceRecord] = []
 
-        if not attendance:
-            continue  # No check-in on this date — student not shown here
+    for row in rows:
 
         # Compute duration:
         # • If already checked out and duration is stored → use stored value
         # • If still active (no exit_time) → compute live from entry_time to now
         total_duration_str = None
-        if attendance.total_duration:
-            total_duration_str = str(attendance.total_duration)
-        elif attendance.entry_time and not attendance.exit_time:
+        if row.total_duration:
+            total_duration_str = str(row.total_duration)
+        elif row.entry_time and not row.exit_time:
             now_utc = datetime.utcnow()
-            entry   = attendance.entry_time
+            entry   = row.entry_time
             # Handle both naive (UTC) and tz-aware entry_time
             if entry.tzinfo is not None:
                 now_utc = datetime.now(timezone.utc)
@@ -1139,34 +1216,35 @@ async def get_admin_attendance(
             minutes = int((diff.total_seconds() % 3600) // 60)
             total_duration_str = f"{hours}h {minutes}m (active)"
 
-        all_records.append(
+        items.append(
             AdminAttendanceRecord(
-                id=str(student.id),
-                student_id=student.student_id,
-                student_name=student.name,
-                email=student.email,
-                mobile=student.mobile_no,
-                entry_time=attendance.entry_time,
-                exit_time=attendance.exit_time,
+                id=str(row.id),
+                student_id=row.student_id,
+                student_name=row.name,
+                email=row.email,
+                mobile=row.mobile_no,
+                entry_time=row.entry_time,
+                exit_time=row.exit_time,
                 total_duration=total_duration_str,
-                # "Present" = still inside, "Completed" = checked out
-                status="Present" if not attendance.exit_time else "Completed",
+                status=row.status,
             )
         )
 
-    all_records.sort(key=lambda x: x.student_id)
-    total = len(all_records)
-    limit = min(max(1, limit), 100)
     page = (skip // limit) + 1 if limit else 1
-    items = all_records[skip : skip + limit]
     return PaginatedResponse(items=items, total=total, page=page, page_size=limit)
 
 @router.get(
     "/revenue",
     response_model=PaginatedResponse[AdminRevenueItem],
-    summary="List revenue/transactions (paginated)",
+    summary="List revenue/transactions (paginated, cached)",
+)
+@cached(
+    ttl=30,
+    key_builder=lambda filter, skip, limit, db, current_admin: admin_revenue_key(
+        str(current_admin.user_id), filter, skip, limit
+    ),
 )
-async def get_admin_revenue(
+def get_admin_revenue(
     filter: str = "all",
     skip: int = 0,
     limit: int = 50,
@@ -1174,8 +1252,6 @@ async def get_admin_revenue(
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get paginated revenue/transaction data. Use filter: today|week|month|all."""
-    from datetime import datetime, timedelta
-    import re
 
     base_query = db.query(SeatBooking).filter(
         SeatBooking.admin_id == current_admin.user_id,
@@ -1193,11 +1269,35 @@ async def get_admin_revenue(
         base_query = base_query.filter(SeatBooking.payment_date >= month_start)
 
     base_query = base_query.order_by(SeatBooking.payment_date.desc())
-    total = base_query.count()
+    total = _count_rows(base_query)
     limit = min(max(1, limit), 100)
-    transactions = base_query.offset(skip).limit(limit).all()
+    # Plain column rows (no ORM objects); the name/email/mobile fallbacks to
+    # the linked student are coalesced in SQL over an outer join.
+    transactions = (
+        base_query.with_entities(
+            SeatBooking.id,
+            SeatBooking.student_id,
+            func.coalesce(func.nullif(SeatBooking.name, ""), func.nullif(Student.name, ""), "Anonymous").label("student_name"),
+            func.coalesce(func.nullif(SeatBooking.email, ""), Student.email).label("email"),
+            func.coalesce(func.nullif(SeatBooking.mobile, ""), Student.mobile_no).label("mobile"),
+            SeatBooking.amount,
+            SeatBooking.subscription_months,
+            SeatBooking.payment_method,
+            SeatBooking.payment_status,
+            SeatBooking.payment_reference,
+            SeatBooking.created_at,
+            SeatBooking.payment_date,
+            SeatBooking.status,
+            SeatBooking.purpose,
+            Student.student_id.label("s_student_id"),
+        )
+        .outerjoin(Student, Student.auth_user_id == SeatBooking.student_id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
-    def _revenue_source(booking: SeatBooking) -> str:
+    def _revenue_source(booking) -> str:
         pm = (booking.payment_method or "").strip().lower()
         pref = (booking.payment_reference or "").strip().lower()
         purpose = (booking.purpose or "").strip().lower()
@@ -1211,9 +1311,9 @@ async def get_admin_revenue(
             return "online"
         return "other"
 
-    def _student_display_id(booking: SeatBooking) -> str | None:
-        if booking.student and booking.student.student_id:
-            return booking.student.student_id
+    def _student_display_id(booking) -> str | None:
+        if booking.s_student_id:
+            return booking.s_student_id
         if booking.student_id:
             return str(booking.student_id)
         text = (booking.payment_reference or "")
@@ -1224,14 +1324,14 @@ async def get_admin_revenue(
         AdminRevenueItem(
             id=str(b.id),
             student_id=_student_display_id(b),
-            student_name=b.name or (b.student.name if b.student else "Anonymous"),
-            email=b.email or (b.student.email if b.student else None),
-            mobile=b.mobile or (b.student.mobile_no if b.student else None),
+            student_name=b.student_name,
+            email=b.email,
+            mobile=b.mobile,
             amount=float(b.amount) if b.amount else 0.0,
             subscription_months=b.subscription_months or 1,
             payment_method=b.payment_method or "Online",
             payment_status=b.payment_status or "paid",
-            transaction_id=getattr(b, "transaction_id", None) or b.payment_reference or f"TXN_{b.id}",
+            transaction_id=b.payment_reference or f"TXN_{b.id}",
             created_at=b.created_at,
             payment_date=b.payment_date or b.created_at,
             status=b.status or "completed",
@@ -1243,133 +1343,158 @@ async def get_admin_revenue(
     page = (skip // limit) + 1 if limit else 1
     return PaginatedResponse(items=items, total=total, page=page, page_size=limit)
 
+
+# Display fields that depend only on the activity type, built once rather
+# than per row: (id prefix, title, description template, icon, color).
+_ACTIVITY_DISPLAY = {
+    "student_registration": ("student", "New student registration", "{name} registered", "👨‍🎓", "emerald"),
+    "booking_request": ("booking", "Seat booking request", "{name} requested a seat", "🪑", "blue"),
+    "student_message": ("message", "Message from student", "{name} sent a message", "💬", "purple"),
+    "student_checkin": ("attendance", "Student checked in", "{name} checked in", "✅", "green"),
+}
+_BOOKING_UPDATE_ACTIVITY = {
+    status: ("booking_update", f"Booking {status}", "{name}'s booking was {status}", icon, color)
+    for status, icon, color in (("approved", "✅", "green"), ("rejected", "❌", "red"))
+}
+
+
 @router.get(
     "/recent-activities",
     response_model=PaginatedResponse[AdminActivityItem],
-    summary="List recent activities (paginated)",
+    summary="List recent activities (paginated, cached)",
 )
-async def get_recent_activities(
+@cached(
+    ttl=30,
+    key_builder=lambda skip, limit, db, current_admin: admin_recent_activities_key(
+        str(current_admin.user_id), skip, limit
+    ),
+)
+def get_recent_activities(
     skip: int = 0,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
     """Get paginated recent activities for admin dashboard (last 7 days)."""
-    from app.models.student import StudentAttendance, StudentMessage
-    from datetime import datetime, timedelta
 
-    activities: List[AdminActivityItem] = []
+    limit = min(max(1, limit), 100)
     try:
-        recent_students = db.query(Student).filter(
-            Student.admin_id == current_admin.user_id,
-            Student.created_at >= datetime.utcnow() - timedelta(days=7),
-        ).order_by(Student.created_at.desc()).limit(50).all()
-        for student in recent_students:
-            activities.append(
-                AdminActivityItem(
-                    id=f"student_{student.id}",
-                    type="student_registration",
-                    title="New student registration",
-                    description=f"{student.name} registered",
-                    timestamp=student.created_at,
-                    icon="👨‍🎓",
-                    color="emerald",
-                )
-            )
-
-        recent_bookings = db.query(SeatBooking).filter(
-            SeatBooking.admin_id == current_admin.user_id,
-            SeatBooking.created_at >= datetime.utcnow() - timedelta(days=7),
-        ).order_by(SeatBooking.created_at.desc()).limit(50).all()
-        for booking in recent_bookings:
-            student_name = booking.name or (booking.student.name if booking.student else "Anonymous")
-            activities.append(
-                AdminActivityItem(
-                    id=f"booking_{booking.id}",
-                    type="booking_request",
-                    title="Seat booking request",
-                    description=f"{student_name} requested a seat",
-                    timestamp=booking.created_at,
-                    icon="🪑",
-                    color="blue",
+        admin_id = current_admin.user_id
+        since = datetime.utcnow() - timedelta(days=7)
+        no_status = cast(None, String)
+
+        def _latest(stmt, ts):
+            # Each source keeps its own newest-50 cap, as separate queries did
+            return stmt.order_by(ts.desc()).limit(50).subquery()
+
+        sources = [
+            _latest(
+                select(
+                    literal("student_registration").label("type"),
+                    Student.id.label("id"),
+                    Student.name.label("name"),
+                    Student.created_at.label("ts"),
+                    no_status.label("status"),
+                ).where(Student.admin_id == admin_id, Student.created_at >= since),
+                Student.created_at,
+            ),
+            _latest(
+                select(
+                    literal("booking_request").label("type"),
+                    SeatBooking.id.label("id"),
+                    func.coalesce(func.nullif(SeatBooking.name, ""), Student.name, "Anonymous").label("name"),
+                    SeatBooking.created_at.label("ts"),
+                    no_status.label("status"),
                 )
-            )
-
-        try:
-            recent_messages = db.query(StudentMessage).filter(
-                StudentMessage.admin_id == current_admin.user_id,
-                StudentMessage.created_at >= datetime.utcnow() - timedelta(days=7),
-                StudentMessage.sender_type == "student",
-            ).order_by(StudentMessage.created_at.desc()).limit(50).all()
-            for message in recent_messages:
-                activities.append(
-                    AdminActivityItem(
-                        id=f"message_{message.id}",
-                        type="student_message",
-                        title="Message from student",
-                        description=f"{message.student_name} sent a message",
-                        timestamp=message.created_at,
-                        icon="💬",
-                        color="purple",
-                    )
+                .outerjoin(Student, Student.auth_user_id == SeatBooking.student_id)
+                .where(SeatBooking.admin_id == admin_id, SeatBooking.created_at >= since),
+                SeatBooking.created_at,
+            ),
+            _latest(
+                select(
+                    literal("student_message").label("type"),
+                    StudentMessage.id.label("id"),
+                    StudentMessage.student_name.label("name"),
+                    StudentMessage.created_at.label("ts"),
+                    no_status.label("status"),
+                ).where(
+                    StudentMessage.admin_id == admin_id,
+                    StudentMessage.created_at >= since,
+                    StudentMessage.sender_type == "student",
+                ),
+                StudentMessage.created_at,
+            ),
+            _latest(
+                select(
+                    literal("student_checkin").label("type"),
+                    StudentAttendance.id.label("id"),
+                    func.coalesce(Student.name, "Student").label("name"),
+                    StudentAttendance.entry_time.label("ts"),
+                    no_status.label("status"),
                 )
-        except Exception as e:
-            logger.warning("Could not query StudentMessage: %s", e)
-
-        try:
-            recent_attendance = db.query(StudentAttendance).filter(
-                StudentAttendance.admin_id == current_admin.user_id,
-                StudentAttendance.entry_time >= datetime.utcnow() - timedelta(days=7),
-            ).order_by(StudentAttendance.entry_time.desc()).limit(50).all()
-            for attendance in recent_attendance:
-                name = attendance.student.name if attendance.student else "Student"
-                activities.append(
-                    AdminActivityItem(
-                        id=f"attendance_{attendance.id}",
-                        type="student_checkin",
-                        title="Student checked in",
-                        description=f"{name} checked in",
-                        timestamp=attendance.entry_time,
-                        icon="✅",
-                        color="green",
-                    )
+                .outerjoin(Student, Student.auth_user_id == StudentAttendance.student_id)
+                .where(StudentAttendance.admin_id == admin_id, StudentAttendance.entry_time >= since),
+                StudentAttendance.entry_time,
+            ),
+            _latest(
+                select(
+                    literal("booking_update").label("type"),
+                    SeatBooking.id.label("id"),
+                    func.coalesce(func.nullif(SeatBooking.name, ""), Student.name, "Anonymous").label("name"),
+                    SeatBooking.updated_at.label("ts"),
+                    SeatBooking.status.label("status"),
                 )
-        except Exception as e:
-            logger.warning("Could not query StudentAttendance: %s", e)
+                .outerjoin(Student, Student.auth_user_id == SeatBooking.student_id)
+                .where(
+                    SeatBooking.admin_id == admin_id,
+                    SeatBooking.updated_at >= since,
+                    SeatBooking.status.in_(["approved", "rejected"]),
+                ),
+                SeatBooking.updated_at,
+            ),
+        ]
+        # One round trip: Postgres merges the sources, sorts and pages; the
+        # total rides along as a window count over the whole union.
+        feed = union_all(*(select(src) for src in sources)).subquery("feed")
+        rows = db.execute(
+            select(feed, func.count().over().label("total"))
+            .order_by(feed.c.ts.desc())
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        total = rows[0].total if rows else (
+            db.execute(select(func.count()).select_from(feed)).scalar() if skip else 0
+        )
 
-        recent_booking_updates = db.query(SeatBooking).filter(
-            SeatBooking.admin_id == current_admin.user_id,
-            SeatBooking.updated_at >= datetime.utcnow() - timedelta(days=7),
-            SeatBooking.status.in_(["approved", "rejected"]),
-        ).order_by(SeatBooking.updated_at.desc()).limit(50).all()
-        for booking in recent_booking_updates:
-            student_name = booking.name or (booking.student.name if booking.student else "Anonymous")
-            status_text = "approved" if booking.status == "approved" else "rejected"
-            activities.append(
+        items: List[AdminActivityItem] = []
+        for row in rows:
+            if row.type == "booking_update":
+                status_text = "approved" if row.status == "approved" else "rejected"
+                id_prefix, title, template, icon, color = _BOOKING_UPDATE_ACTIVITY[status_text]
+            else:
+                id_prefix, title, template, icon, color = _ACTIVITY_DISPLAY[row.type]
+                status_text = None
+            items.append(
                 AdminActivityItem(
-                    id=f"booking_update_{booking.id}",
-                    type="booking_update",
-                    title=f"Booking {status_text}",
-                    description=f"{student_name}'s booking was {status_text}",
-                    timestamp=booking.updated_at,
-                    icon="✅" if booking.status == "approved" else "❌",
-                    color="green" if booking.status == "approved" else "red",
+                    id=f"{id_prefix}_{row.id}",
+                    type=row.type,
+                    title=title,
+                    description=template.format(name=row.name, status=status_text),
+                    timestamp=row.ts,
+                    icon=icon,
+                    color=color,
                 )
             )
 
-        activities.sort(key=lambda x: x.timestamp, reverse=True)
-        total = len(activities)
-        limit = min(max(1, limit), 100)
         page = (skip // limit) + 1 if limit else 1
-        items = activities[skip : skip + limit]
         return PaginatedResponse(items=items, total=total, page=page, page_size=limit)
     except Exception as e:
         logger.exception("Error fetching recent activities")
-        return PaginatedResponse(items=[], total=0, page=1, page_size=min(max(1, limit), 100))
+        return PaginatedResponse(items=[], total=0, page=1, page_size=limit)
 
 
 @router.post("/scan-student-qr")
-async def scan_student_qr(
+def scan_student_qr(
     body: AdminScanRequest,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
@@ -1382,7 +1507,7 @@ async def scan_student_qr(
 
 
 @router.post("/transfers/initiate")
-async def initiate_student_transfer(
+def initiate_student_transfer(
     body: TransferInitiateRequest,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
@@ -1418,7 +1543,7 @@ async def initiate_student_transfer(
 
 
 @router.post("/transfers/confirm-payment")
-async def confirm_student_transfer_payment(
+def confirm_student_transfer_payment(
     body: TransferPaymentConfirmRequest,
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
@@ -1438,7 +1563,7 @@ async def confirm_student_transfer_payment(
 
 
 @router.get("/transfers")
-async def get_admin_transfer_requests(
+def get_admin_transfer_requests(
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy import case, or_
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.schemas.auth import (
     AdminSignUp,
@@ -21,13 +24,22 @@ from app.schemas.auth import (
 from app.models.admin import AdminUser, AdminDetails
 from app.models.email_delivery_log import EmailDeliveryLog
 from app.models.student import Student
-from app.auth.jwt import create_access_token, verify_password, get_password_hash
-from app.auth.dependencies import get_current_admin
+from app.auth.jwt import (
+    create_access_token,
+    generate_url_token,
+    get_password_hash,
+    url_token_lookup_values,
+    verify_and_update_password,
+    verify_password,
+)
+from app.auth.dependencies import get_current_admin, get_current_admin_details
 from app.core.config import settings
 from app.services.email_queue_service import enqueue_email_job
-import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 ADMIN_VERIFICATION_RESEND_COOLDOWN_SECONDS = 60
 PASSWORD_RESET_EMAIL_COOLDOWN_SECONDS = 60
 
@@ -38,17 +50,18 @@ def _password_reset_cooldown_response(
     email_type: str,
     to_email: str,
 ) -> None:
-    latest_delivery = (
-        db.query(EmailDeliveryLog)
+    # Only the newest timestamp is needed; skip the payload_json column
+    last_created_at = (
+        db.query(EmailDeliveryLog.created_at)
         .filter(
             EmailDeliveryLog.email_type == email_type,
             EmailDeliveryLog.to_email == to_email,
         )
         .order_by(EmailDeliveryLog.created_at.desc())
-        .first()
+        .limit(1)
+        .scalar()
     )
-    if latest_delivery and latest_delivery.created_at:
-        last_created_at = latest_delivery.created_at
+    if last_created_at:
         if last_created_at.tzinfo is None:
             last_created_at = last_created_at.replace(tzinfo=timezone.utc)
         elapsed_seconds = int((datetime.now(timezone.utc) - last_created_at).total_seconds())
@@ -64,9 +77,9 @@ def _password_reset_cooldown_response(
             )
 
 @router.post("/admin/signup", response_model=UserResponse)
-async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session = Depends(get_db)):
+def admin_signup(admin_data: AdminSignUp, request: Request, db: Session = Depends(get_db)):
     """Register a new admin with email verification"""
-    existing_admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email.lower()).first()
+    existing_admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
     if existing_admin:
         # If account is active and verified, suggest signing in instead
         if existing_admin.status == "active" and existing_admin.email_verified:
@@ -77,12 +90,10 @@ async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session =
         # If account is pending, allow re-signup by updating the existing account
         elif existing_admin.status == "pending":
             # Update existing pending account with new password and token
-            verification_token = str(uuid.uuid4())
+            verification_token, verification_token_hash = generate_url_token()
             existing_admin.hashed_password = get_password_hash(admin_data.password)
-            existing_admin.email_verification_token = verification_token
+            existing_admin.email_verification_token = verification_token_hash
             existing_admin.email_verified = False
-            db.commit()
-            db.refresh(existing_admin)
             
             # Update admin details if provided
             if any([admin_data.library_name, admin_data.mobile_no, admin_data.address, admin_data.total_seats]):
@@ -102,7 +113,7 @@ async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session =
                         total_seats=admin_data.total_seats or 0
                     )
                     db.add(admin_details)
-                db.commit()
+            db.commit()
             
             delivery_id = enqueue_email_job(
                 db=db,
@@ -127,20 +138,20 @@ async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session =
                 detail="Admin with this email already exists. Please contact support."
             )
     # Generate verification token
-    verification_token = str(uuid.uuid4())
+    verification_token, verification_token_hash = generate_url_token()
     # Create admin user with status 'pending'
     hashed_password = get_password_hash(admin_data.password)
     admin_user = AdminUser(
-        email=admin_data.email.lower(),
+        email=admin_data.email,
         hashed_password=hashed_password,
         role="admin",
         status="pending",
-        email_verification_token=verification_token,
+        email_verification_token=verification_token_hash,
         email_verified=False
     )
     db.add(admin_user)
-    db.commit()
-    db.refresh(admin_user)
+    # Flush for user_id; the admin and its details commit together below
+    db.flush()
     # Create admin details if provided
     if any([admin_data.library_name, admin_data.mobile_no, admin_data.address, admin_data.total_seats]):
         admin_details = AdminDetails(
@@ -152,7 +163,7 @@ async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session =
             total_seats=admin_data.total_seats or 0
         )
         db.add(admin_details)
-        db.commit()
+    db.commit()
     delivery_id = enqueue_email_job(
         db=db,
         email_type="admin_verification",
@@ -171,9 +182,9 @@ async def admin_signup(admin_data: AdminSignUp, request: Request, db: Session =
     )
 
 @router.get("/admin/verify-email")
-async def verify_admin_email(token: str, db: Session = Depends(get_db)):
+def verify_admin_email(token: str, db: Session = Depends(get_db)):
     """Verify admin email using the token from the email link"""
-    admin = db.query(AdminUser).filter(AdminUser.email_verification_token == token).first()
+    admin = db.query(AdminUser).filter(AdminUser.email_verification_token.in_(url_token_lookup_values(token))).first()
     if not admin:
         raise HTTPException(status_code=400, detail="Invalid or expired verification token.")
     if admin.email_verified:
@@ -186,29 +197,29 @@ async def verify_admin_email(token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/admin/resend-verification")
-async def resend_admin_verification(
+def resend_admin_verification(
     request_data: AdminResendVerificationRequest,
     request: Request,
     db: Session = Depends(get_db),
 ):
     """Resend admin verification email with a short cooldown to avoid abuse."""
-    admin = db.query(AdminUser).filter(AdminUser.email == request_data.email.lower()).first()
+    admin = db.query(AdminUser).filter(AdminUser.email == request_data.email).first()
     if not admin:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found.")
     if admin.email_verified or admin.status == "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Account is already verified.")
 
-    latest_delivery = (
-        db.query(EmailDeliveryLog)
+    last_created_at = (
+        db.query(EmailDeliveryLog.created_at)
         .filter(
             EmailDeliveryLog.email_type == "admin_verification",
             EmailDeliveryLog.to_email == admin.email,
         )
         .order_by(EmailDeliveryLog.created_at.desc())
-        .first()
+        .limit(1)
+        .scalar()
     )
-    if latest_delivery and latest_delivery.created_at:
-        last_created_at = latest_delivery.created_at
+    if last_created_at:
         if last_created_at.tzinfo is None:
             last_created_at = last_created_at.replace(tzinfo=timezone.utc)
         elapsed_seconds = int((datetime.now(timezone.utc) - last_created_at).total_seconds())
@@ -223,8 +234,8 @@ async def resend_admin_verification(
                 },
             )
 
-    verification_token = str(uuid.uuid4())
-    admin.email_verification_token = verification_token
+    verification_token, verification_token_hash = generate_url_token()
+    admin.email_verification_token = verification_token_hash
     admin.email_verified = False
     db.commit()
     db.refresh(admin)
@@ -244,11 +255,18 @@ async def resend_admin_verification(
     }
 
 @router.post("/admin/signin", response_model=Token)
-async def admin_signin(admin_data: AdminSignIn, db: Session = Depends(get_db)):
+def admin_signin(admin_data: AdminSignIn, db: Session = Depends(get_db)):
     """Admin login"""
-    admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email.lower()).first()
+    admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
+    
+    if not admin:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
     
-    if not admin or not verify_password(admin_data.password, admin.hashed_password):
+    verified, new_hash = verify_and_update_password(admin_data.password, admin.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -260,6 +278,11 @@ async def admin_signin(admin_data: AdminSignIn, db: Session = Depends(get_db)):
             detail="Account is not active"
         )
     
+    if new_hash:
+        # Stored hash used an outdated bcrypt cost; replace it now that we have the plaintext
+        admin.hashed_password = new_hash
+        db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(admin.user_id), "email": admin.email, "user_type": "admin"},
@@ -270,7 +293,7 @@ async def admin_signin(admin_data: AdminSignIn, db: Session = Depends(get_db)):
 
 
 @router.post("/admin/forgot-password")
-async def admin_forgot_password(
+def admin_forgot_password(
     request_data: PasswordReset,
     db: Session = Depends(get_db),
 ):
@@ -279,14 +302,14 @@ async def admin_forgot_password(
         "success": True,
         "message": "If an account exists for this email, you will receive password reset instructions shortly.",
     }
-    admin = db.query(AdminUser).filter(AdminUser.email == request_data.email.lower()).first()
+    admin = db.query(AdminUser).filter(AdminUser.email == request_data.email).first()
     if not admin or admin.status != "active" or not admin.email_verified:
         return ok_message
 
     _password_reset_cooldown_response(db, email_type="admin_password_reset", to_email=admin.email)
 
-    reset_token = str(uuid.uuid4())
-    admin.password_reset_token = reset_token
+    reset_token, reset_token_hash = generate_url_token()
+    admin.password_reset_token = reset_token_hash
     db.commit()
     db.refresh(admin)
 
@@ -301,8 +324,8 @@ async def admin_forgot_password(
 
 
 @router.post("/admin/reset-password")
-async def admin_reset_password(request_data: AdminResetPasswordConfirm, db: Session = Depends(get_db)):
-    admin = db.query(AdminUser).filter(AdminUser.password_reset_token == request_data.token).first()
+def admin_reset_password(request_data: AdminResetPasswordConfirm, db: Session = Depends(get_db)):
+    admin = db.query(AdminUser).filter(AdminUser.password_reset_token.in_(url_token_lookup_values(request_data.token))).first()
     if not admin:
         raise HTTPException(status_code=400, detail="Invalid or expired password reset link.")
     if len(request_data.new_password) < 6:
@@ -314,7 +337,7 @@ async def admin_reset_password(request_data: AdminResetPasswordConfirm, db: Sess
 
 
 @router.post("/student/forgot-password")
-async def student_forgot_password(
+def student_forgot_password(
     request_data: StudentForgotPasswordRequest,
     db: Session = Depends(get_db),
 ):
@@ -327,7 +350,7 @@ async def student_forgot_password(
     sid = (request_data.student_id or "").strip().upper()
     email_val = None
     if request_data.email is not None:
-        email_val = str(request_data.email).strip().lower()
+        email_val = str(request_data.email).strip()
     if sid:
         student = db.query(Student).filter(Student.student_id == sid).first()
     if not student and email_val:
@@ -338,12 +361,14 @@ async def student_forgot_password(
 
     _password_reset_cooldown_response(db, email_type="student_password_reset", to_email=student.email)
 
-    reset_token = str(uuid.uuid4())
-    student.password_reset_token = reset_token
+    reset_token, reset_token_hash = generate_url_token()
+    student.password_reset_token = reset_token_hash
     db.commit()
 
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == student.admin_id).first()
-    library_name = admin_details.library_name if admin_details else "your library"
+    library_name = (
+        db.query(AdminDetails.library_name).filter(AdminDetails.user_id == student.admin_id).scalar()
+        or "your library"
+    )
     reset_url = f"{settings.FRONTEND_BASE_URL}/student/set-password?token={reset_token}"
 
     enqueue_email_job(
@@ -363,15 +388,18 @@ async def student_forgot_password(
 defunct = True  # This disables the endpoint for self-signup
 
 @router.post("/admin/student/signup", response_model=StudentRegistrationResponse)
-async def admin_student_signup(
+def admin_student_signup(
     student_data: StudentSignUpByAdmin, 
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin),
+    admin_details: Optional[AdminDetails] = Depends(get_current_admin_details),
     request: Request = None
 ):
     """Register a new student by admin"""
     # Check if student already exists
-    existing_student = db.query(Student).filter(Student.email == student_data.email.lower()).first()
+    existing_student = db.query(
+        db.query(Student.id).filter(Student.email == student_data.email).exists()
+    ).scalar()
     if existing_student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -380,10 +408,18 @@ async def admin_student_signup(
     
     # Generate student ID
     from app.services.student_service import generate_student_id
-    student_id = await generate_student_id(current_admin.user_id, db)
+    try:
+        student_id = generate_student_id(current_admin.user_id, db, admin_details)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Admin profile is incomplete. Please save admin details before adding students."
+        ) from exc
+    # Read before the commits below expire the row; only the name goes in the email payload.
+    library_name = admin_details.library_name or "your library"
     
     # Generate password setup token
-    password_setup_token = str(uuid.uuid4())
+    password_setup_token, password_setup_token_hash = generate_url_token()
     try:
         # Create student with no password yet
         # Set mobile number as initial password
@@ -394,9 +430,9 @@ async def admin_student_signup(
             student_id=student_id,
             admin_id=current_admin.user_id,
             name=student_data.name,
-            email=student_data.email.lower(),
+            email=student_data.email,
             hashed_password=hashed_initial_password,  # Mobile number as initial password
-            password_reset_token=password_setup_token,
+            password_reset_token=password_setup_token_hash,
             mobile_no=student_data.mobile_no,
             address=student_data.address,
             subscription_start=student_data.subscription_start,
@@ -420,18 +456,14 @@ async def admin_student_signup(
             db.refresh(student)
         invalidate_seat_caches(db, student)
         
-        print(f"✓ Student created successfully: {student.email} with ID: {student.student_id}")
-        
     except Exception as e:
         db.rollback()
-        print(f"❌ Error creating student: {e}")
+        logger.exception("Error creating student")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create student: {str(e)}"
         )
 
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
-    library_name = admin_details.library_name if admin_details else "your library"
     enqueue_email_job(
         db=db,
         email_type="student_password_setup",
@@ -454,12 +486,12 @@ async def admin_student_signup(
     )
 
 @router.post("/student/set-password")
-async def set_student_password(request_data: StudentSetPassword, db: Session = Depends(get_db)):
+def set_student_password(request_data: StudentSetPassword, db: Session = Depends(get_db)):
     """Set student password - supports both token-based and first-time login"""
     # Handle both token-based and student_id-based password setup
     if request_data.token:
         # Token-based password setup (from email link)
-        student = db.query(Student).filter(Student.password_reset_token == request_data.token).first()
+        student = db.query(Student).filter(Student.password_reset_token.in_(url_token_lookup_values(request_data.token))).first()
         if not student:
             raise HTTPException(status_code=400, detail="Invalid or expired password setup token.")
     elif request_data.student_id:
@@ -491,14 +523,16 @@ async def set_student_password(request_data: StudentSetPassword, db: Session = D
 
 
 @router.post("/student/signin", response_model=Token)
-async def student_signin(student_data: StudentSignIn, db: Session = Depends(get_db)):
+def student_signin(student_data: StudentSignIn, db: Session = Depends(get_db)):
     """Student login"""
-    # Try to find student by email first, then by student_id
-    student = db.query(Student).filter(Student.email == student_data.email.lower()).first()
-    
-    if not student:
-        # Try to find by student_id (username)
-        student = db.query(Student).filter(Student.student_id == student_data.email.upper()).first()
+    # Match by email or by student_id (username) in one query; an email match wins
+    by_email = Student.email == student_data.email.lower()
+    student = (
+        db.query(Student)
+        .filter(or_(by_email, Student.student_id == student_data.email.upper()))
+        .order_by(case((by_email, 0), else_=1))
+        .first()
+    )
     
     if not student:
         raise HTTPException(
@@ -513,37 +547,22 @@ async def student_signin(student_data: StudentSignIn, db: Session = Depends(get_
             detail="Please set your password first. Check your email for the password setup link."
         )
     
-    if not verify_password(student_data.password, student.hashed_password):
+    verified, new_hash = verify_and_update_password(student_data.password, student.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username/email or password"
         )
     
-    # Check if this is first login (password is still mobile number)
-    # For first login, the password should be the mobile number
-    is_first_login = False
-    try:
-        # Check if the current password matches the mobile number
-        is_first_login = verify_password(student.mobile_no, student.hashed_password)
-        print(f"[DEBUG] First login check - Mobile: {student.mobile_no}, Is first login: {is_first_login}")
-        
-        # Additional check: if password is exactly the mobile number (unhashed comparison)
-        # This is a fallback check
-        if not is_first_login:
-            # Try to hash the mobile number and compare
-            mobile_hash = get_password_hash(student.mobile_no)
-            if mobile_hash == student.hashed_password:
-                is_first_login = True
-                print(f"[DEBUG] First login detected via hash comparison")
-                
-    except Exception as e:
-        # If verification fails, it's not first login
-        is_first_login = False
-        print(f"[DEBUG] First login check failed: {e}")
+    if new_hash:
+        # Stored hash used an outdated bcrypt cost; replace it now that we have the plaintext
+        student.hashed_password = new_hash
+        db.commit()
     
-    print(f"[DEBUG] Final is_first_login value: {is_first_login}")
-    print(f"[DEBUG] Student mobile: {student.mobile_no}")
-    print(f"[DEBUG] Hashed password exists: {bool(student.hashed_password)}")
+    # First login = the stored password is still the mobile number. The submitted
+    # password just verified against that hash, so the hash matches the mobile
+    # number exactly when the two strings are equal; no second bcrypt verify.
+    is_first_login = bool(student.mobile_no) and student_data.password == student.mobile_no
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
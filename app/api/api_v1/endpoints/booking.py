@@ -5,6 +5,7 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 import math
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_admin, get_current_student, get_current_user_optional
 from app.schemas.booking import SeatBookingCreate, SeatBookingUpdate, SeatBookingResponse, LibraryInfo, StudentSeatBookingCreate, PaymentConfirmation, RazorpayOrderCreate, RazorpayOrderResponse, RazorpayPaymentVerify
@@ -18,7 +19,7 @@ from app.utils.subscription_plan_scope import apply_plan_shift_filters
 from app.utils.razorpay_route import order_transfers_to_library
 from app.services.email_queue_service import enqueue_email_job
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 # Cache TTL for library occupied count (seconds)
 LIBRARY_OCCUPIED_TTL = 60
@@ -538,7 +539,7 @@ async def verify_student_booking_token_payment(
     return booking
 
 @router.patch("/seat-bookings/{booking_id}", response_model=SeatBookingResponse)
-async def patch_seat_booking(
+def patch_seat_booking(
     booking_id: str,
     booking_data: SeatBookingUpdate,
     db: Session = Depends(get_db),
@@ -569,7 +570,7 @@ async def patch_seat_booking(
             from app.auth.jwt import get_password_hash
             from app.services.student_service import generate_student_id
             
-            student_id = await generate_student_id(current_admin.user_id, db)
+            student_id = generate_student_id(current_admin.user_id, db)
             
             student = Student(
                 auth_user_id=student_id,
@@ -701,7 +702,7 @@ async def confirm_payment(
         else:
             # Create new student
             from app.services.student_service import generate_student_id
-            student_id = await generate_student_id(booking.admin_id, db)
+            student_id = generate_student_id(booking.admin_id, db)
             
             student = Student(
                 auth_user_id=student_id,
@@ -942,7 +943,7 @@ async def verify_razorpay_payment(
         else:
             # Create new student
             from app.services.student_service import generate_student_id
-            student_id = await generate_student_id(booking.admin_id, db)
+            student_id = generate_student_id(booking.admin_id, db)
             
             student = Student(
                 auth_user_id=student_id,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, func, select, true
 from typing import List, Optional
 from datetime import datetime, timezone
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_admin, get_current_student
 from app.schemas.messaging import (
@@ -14,7 +15,7 @@ from app.models.student import StudentMessage, Student
 from app.models.admin import AdminUser, AdminDetails
 from app.core.cache import invalidate_admin_caches, invalidate_student_dashboard
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 @router.post("/send-message", response_model=MessageResponse)
 async def send_student_message(
@@ -250,10 +251,8 @@ async def get_students_with_messages(
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Get students with their latest message for admin chat interface"""
-    students = db.query(Student).filter(Student.admin_id == current_admin.user_id).all()
-    
-    result = []
-    
+    admin_id = current_admin.user_id
+
     def _normalize_dt(dt: datetime | None) -> datetime | None:
         """Ensure datetime is naive in UTC for safe comparisons/sorting."""
         if not dt:
@@ -264,31 +263,51 @@ async def get_students_with_messages(
             return dt
         except Exception:
             return dt
-    for student in students:
-        # Get latest message for this student
-        latest_message = db.query(StudentMessage).filter(
-            StudentMessage.student_id == student.id,
-            StudentMessage.admin_id == current_admin.user_id
-        ).order_by(StudentMessage.created_at.desc()).first()
-        
-        # Count unread messages from this student
-        unread_count = db.query(StudentMessage).filter(
-            StudentMessage.student_id == student.id,
-            StudentMessage.admin_id == current_admin.user_id,
+    # Latest message and unread count per student, ordered newest-first in
+    # SQL (students without messages last) instead of two queries per student.
+    latest = (
+        select(StudentMessage.message, StudentMessage.created_at)
+        .where(
+            StudentMessage.student_id == Student.id,
+            StudentMessage.admin_id == admin_id,
+        )
+        .order_by(StudentMessage.created_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    unread_count = (
+        select(func.count())
+        .where(
+            StudentMessage.student_id == Student.id,
+            StudentMessage.admin_id == admin_id,
             StudentMessage.sender_type == "student",
-            StudentMessage.read == False
-        ).count()
-        
-        result.append({
-            "student_id": str(student.id),
-            "student_name": student.name,
-            "email": student.email,
-            "latest_message": latest_message.message if latest_message else None,
-            "latest_message_time": _normalize_dt(latest_message.created_at) if latest_message else None,
-            "unread_count": unread_count
-        })
-    
-    # Sort by latest message time
-    result.sort(key=lambda x: x["latest_message_time"] or datetime.min, reverse=True)
-    
-    return result
+            StudentMessage.read == False,
+        )
+        .correlate(Student)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            Student.id,
+            Student.name,
+            Student.email,
+            latest.c.message,
+            latest.c.created_at,
+            unread_count.label("unread_count"),
+        )
+        .outerjoin(latest, true())
+        .where(Student.admin_id == admin_id)
+        .order_by(latest.c.created_at.desc().nulls_last())
+    ).all()
+
+    return [
+        {
+            "student_id": str(row.id),
+            "student_name": row.name,
+            "email": row.email,
+            "latest_message": row.message,
+            "latest_message_time": _normalize_dt(row.created_at),
+            "unread_count": row.unread_count,
+        }
+        for row in rows
+    ]
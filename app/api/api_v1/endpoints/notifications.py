@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_student, get_current_admin
 from app.schemas.notification import (
@@ -13,7 +14,7 @@ from app.models.student import Student, StudentTask, StudentExam, StudentNotific
 from app.models.admin import AdminUser
 from app.services.notification_service import NotificationService
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_student_notifications(
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import uuid
 import logging
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_student
 from app.models.student import Student
@@ -23,7 +24,7 @@ from app.services.qr_transfer_service import (
 from app.services.razorpay_service import razorpay_service
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 @router.post("/create-order")
 async def create_payment_order(
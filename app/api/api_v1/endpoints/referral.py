@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List, Optional
 import string
 import random
 import time
 import uuid
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_admin, get_current_student, get_current_user
 from app.schemas.referral import (
@@ -17,7 +19,7 @@ from app.models.admin import AdminUser
 from app.models.student import Student
 from app.services.email_queue_service import enqueue_email_job
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 @router.get("/test")
 async def test_referral_endpoint():
@@ -324,26 +326,18 @@ async def get_referrals_summary(
 ):
     """Get referral summary (total points, counts) for current user"""
     user_id = current_user["user_id"]
-    user_referrals = db.query(Referral).filter(Referral.referrer_id == user_id).all()
-    total_points = 0
-    completed = 0
-    pending = 0
-    for r in user_referrals:
-        try:
-            pts = int(r.points_awarded or "0")
-        except Exception:
-            pts = 0
-        total_points += pts
-        status = (r.status or "").lower()
-        if status == "completed":
-            completed += 1
-        else:
-            pending += 1
+    # Aggregated in the database instead of loading every referral row
+    is_completed = func.lower(func.coalesce(Referral.status, "")) == "completed"
+    total_points, completed, total_referrals = db.query(
+        func.coalesce(func.sum(Referral.points_awarded), 0),
+        func.count().filter(is_completed),
+        func.count(),
+    ).filter(Referral.referrer_id == user_id).one()
     return {
-        "total_points": total_points,
+        "total_points": int(total_points),
         "completed": completed,
-        "pending": pending,
-        "total_referrals": len(user_referrals)
+        "pending": total_referrals - completed,
+        "total_referrals": total_referrals
     }
 
 @router.put("/referrals/{referral_id}", response_model=ReferralResponse)
@@ -7,11 +7,12 @@ import uuid
 from datetime import datetime, timezone
 import logging
 
+from app.api.routing import LazyAPIRoute
 from app.core.mime_guess import get_mime_from_buffer
 
 from app.database import get_db
 from app.auth.dependencies import get_current_student
-from app.auth.jwt import get_password_hash
+from app.auth.jwt import get_password_hash, url_token_lookup_values
 from app.schemas.student import (
     StudentResponse,
     StudentUpdate,
@@ -34,6 +35,7 @@ from app.models.student import (
 )
 from app.services.notification_service import NotificationService
 from app.services.qr_transfer_service import issue_student_qr_token
+from app.utils.attendance_filters import entry_on_day
 from app.core.config import settings
 from app.core.cache import (
     admin_location_key,
@@ -49,7 +51,7 @@ from app.core.cache import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 def _calculate_distance_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -76,10 +78,10 @@ async def test_auth(
     }
 
 @router.get("/set-password")
-async def get_set_password_page(token: str, db: Session = Depends(get_db)):
+def get_set_password_page(token: str, db: Session = Depends(get_db)):
     """Get password setup page - validates token and shows form"""
     # Validate token
-    student = db.query(Student).filter(Student.password_reset_token == token).first()
+    student = db.query(Student).filter(Student.password_reset_token.in_(url_token_lookup_values(token))).first()
     if not student:
         raise HTTPException(status_code=404, detail="Invalid or expired token")
     
@@ -91,7 +93,7 @@ async def get_set_password_page(token: str, db: Session = Depends(get_db)):
     }
 
 @router.post("/set-password")
-async def set_student_password(
+def set_student_password(
     request: dict,
     db: Session = Depends(get_db)
 ):
@@ -107,7 +109,7 @@ async def set_student_password(
     
     # If token provided, find student by token
     if token:
-        student = db.query(Student).filter(Student.password_reset_token == token).first()
+        student = db.query(Student).filter(Student.password_reset_token.in_(url_token_lookup_values(token))).first()
         if not student:
             raise HTTPException(status_code=404, detail="Invalid or expired token.")
     # If student_id provided (for first login), find student by ID
@@ -129,7 +131,7 @@ async def set_student_password(
                 
         except Exception as e:
             # If verification fails, it's not first login
-            print(f"[DEBUG] First login check failed in set-password: {e}")
+            logger.debug("First login check failed in set-password: %s", e)
             raise HTTPException(status_code=400, detail="Password has already been set. Please use your existing password.")
     else:
         raise HTTPException(status_code=400, detail="Either token or student_id is required.")
@@ -151,7 +153,7 @@ async def set_student_password(
     }
 
 @router.post("/set-password-manual")
-async def set_student_password_manual(
+def set_student_password_manual(
     request: dict,
     db: Session = Depends(get_db)
 ):
@@ -325,7 +327,7 @@ async def get_student_dashboard_stats(
     today = date.today()
     today_attendance = db.query(StudentAttendance).filter(
         StudentAttendance.student_id == current_student.auth_user_id,
-        func.date(StudentAttendance.entry_time) == today,
+        entry_on_day(today),
         StudentAttendance.exit_time.is_(None)
     ).first()
     
@@ -403,7 +405,7 @@ async def get_student_dashboard_stats(
         while True:
             day_attendance = db.query(StudentAttendance).filter(
                 StudentAttendance.student_id == current_student.auth_user_id,
-                func.date(StudentAttendance.entry_time) == current_date
+                entry_on_day(current_date)
             ).first()
             
             if day_attendance:
@@ -734,7 +736,7 @@ async def get_student_attendance_history(
         # Convert date string to datetime for comparison
         try:
             date_obj = datetime.strptime(date, '%Y-%m-%d').date()
-            query = query.filter(func.date(StudentAttendance.entry_time) == date_obj)
+            query = query.filter(entry_on_day(date_obj))
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_admin
 from app.models.admin import AdminUser
@@ -16,7 +17,7 @@ from app.schemas.student_removal import (
     RemovalRequestStatus,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 def _api_removal_status_to_db(
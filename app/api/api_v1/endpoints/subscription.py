@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import logging
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_admin
 from app.schemas.subscription import (
@@ -13,7 +15,9 @@ from app.models.subscription import SubscriptionPlan
 from app.models.admin import AdminUser, AdminDetails
 from app.utils.subscription_plan_scope import validate_plan_shift_fields
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 def _admin_library(db: Session, current_admin: AdminUser) -> AdminDetails:
@@ -114,10 +118,7 @@ async def get_subscription_plans(
 
         return plans
     except Exception as e:
-        import traceback
-
-        print("Error in get_subscription_plans:", e)
-        traceback.print_exc()
+        logger.exception("Error in get_subscription_plans")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timedelta
 
+from app.api.routing import LazyAPIRoute
 from app.database import get_db
 from app.auth.dependencies import get_current_student, get_current_admin
 from app.schemas.subscription_management import SubscriptionPurchase
@@ -16,7 +17,7 @@ from app.utils.subscription_plan_scope import (
     apply_plan_shift_filters,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 @router.get("/plans", response_model=List[SubscriptionPlanResponse])
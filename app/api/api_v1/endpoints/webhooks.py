@@ -5,13 +5,14 @@ import json
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
+from app.api.routing import LazyAPIRoute
 from app.auth.dependencies import get_current_admin
 from app.database import get_db
 from app.models.email_delivery_log import EmailDeliveryLog
 from app.core.config import settings
 from app.services.qr_transfer_service import complete_transfer_payment, mark_transfer_payment_verified
 
-router = APIRouter()
+router = APIRouter(route_class=LazyAPIRoute)
 
 
 @router.post("/email-events")
@@ -0,0 +1,144 @@
+"""
+Router helpers shared by the versioned API routers.
+
+FastAPI's ``include_router`` rebuilds every child route from scratch (a fresh
+``APIRoute.__init__`` per route, per include level). The endpoint routers are
+already fully built when they are mounted, so here the routes are shallow-copied
+with the mount prefix and tags applied instead.
+
+``LazyAPIRoute`` goes one step further and postpones the expensive part of
+``APIRoute.__init__`` (dependency graph, request body and response model
+fields, request handler) until the route is first used.
+"""
+import copy
+from typing import Any, Callable, Iterable, List, Optional, Type
+
+from fastapi import APIRouter, Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, request_response
+from starlette.routing import compile_path, get_name
+
+
+class LazyAPIRoute(APIRoute):
+    """APIRoute that only stores its constructor arguments until first use.
+
+    Everything Starlette needs to match a request or build a URL (path regex,
+    methods, name) is computed eagerly. Any other attribute access, e.g. the
+    ``app`` handler on the first matching request, ``dependant`` during OpenAPI
+    generation or ``response_model`` while being included into another router,
+    runs the regular ``APIRoute.__init__`` once with the route's current path
+    and tags.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        self._deferred_init = kwargs
+        self.path = path
+        self.endpoint = endpoint
+        self.name = get_name(endpoint) if kwargs.get("name") is None else kwargs["name"]
+        self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+        self.methods = {method.upper() for method in (kwargs.get("methods") or ["GET"])}
+        self.tags = list(kwargs.get("tags") or [])
+        self.include_in_schema = kwargs.get("include_in_schema", True)
+
+    @property
+    def deferred(self) -> bool:
+        """True while the full APIRoute initialisation has not run yet."""
+        return self.__dict__.get("_deferred_init") is not None
+
+    def materialize(self) -> None:
+        """Run the deferred ``APIRoute.__init__`` (no-op once done)."""
+        kwargs = self.__dict__.get("_deferred_init")
+        if kwargs is None:
+            return
+        # Cleared first so attribute lookups inside APIRoute.__init__ don't recurse.
+        self._deferred_init = None
+        APIRoute.__init__(
+            self,
+            self.path,
+            self.endpoint,
+            **{**kwargs, "name": self.name, "tags": self.tags},
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes missing from the instance dict.
+        if name.startswith("__") or self.__dict__.get("_deferred_init") is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self.materialize()
+        return getattr(self, name)
+
+
+def clone_route(
+    route: APIRoute,
+    prefix: str = "",
+    tags: Optional[List[str]] = None,
+    dependency_overrides_provider: Optional[Any] = None,
+    default_response_class: Optional[Type[Response]] = None,
+) -> APIRoute:
+    """Return a shallow copy of ``route`` mounted under ``prefix`` with ``tags`` prepended.
+
+    ``dependency_overrides_provider`` (normally the FastAPI app) is what
+    ``include_router`` would hand down so ``app.dependency_overrides`` apply.
+    ``default_response_class`` replaces the response class of routes that did
+    not set one explicitly, like the app/router default does for ``include_router``.
+    """
+    cloned = copy.copy(route)
+    cloned.path = prefix + route.path
+    cloned.path_regex, cloned.path_format, cloned.param_convertors = compile_path(cloned.path)
+    cloned.tags = list(tags or []) + list(route.tags or [])
+    overrides = {}
+    if dependency_overrides_provider is not None:
+        overrides["dependency_overrides_provider"] = dependency_overrides_provider
+    if default_response_class is not None and not isinstance(default_response_class, DefaultPlaceholder):
+        if isinstance(cloned, LazyAPIRoute) and cloned.deferred:
+            response_class = cloned._deferred_init.get("response_class", Default(JSONResponse))
+        else:
+            response_class = cloned.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            overrides["response_class"] = default_response_class
+
+    if isinstance(cloned, LazyAPIRoute) and cloned.deferred:
+        if overrides:
+            cloned._deferred_init = {**cloned._deferred_init, **overrides}
+        # unique_id is derived from the final path when the copy materializes.
+        return cloned
+
+    if overrides:
+        # The request handler closes over both, so it has to be rebuilt.
+        for name, value in overrides.items():
+            setattr(cloned, name, value)
+        cloned.app = request_response(cloned.get_route_handler())
+
+    generate_unique_id = route.generate_unique_id_function
+    if isinstance(generate_unique_id, DefaultPlaceholder):
+        generate_unique_id = generate_unique_id.value
+    cloned.unique_id = cloned.operation_id or generate_unique_id(cloned)
+    return cloned
+
+
+def include_flat(
+    parent: APIRouter,
+    router: APIRouter,
+    prefix: str = "",
+    tags: Optional[Iterable[str]] = None,
+    dependency_overrides_provider: Optional[Any] = None,
+    default_response_class: Optional[Type[Response]] = None,
+) -> None:
+    """Mount ``router`` on ``parent`` by appending prefixed copies of its routes.
+
+    Equivalent to ``parent.include_router(router, prefix=prefix, tags=tags)`` for
+    routers that only hold ``APIRoute`` entries and no include-level dependencies.
+    """
+    if prefix:
+        assert prefix.startswith("/"), "A path prefix must start with '/'"
+        assert not prefix.endswith("/"), "A path prefix must not end with '/'"
+    tag_list = list(tags or [])
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            raise TypeError(f"include_flat only supports APIRoute entries, got {type(route).__name__}")
+    parent.routes.extend(
+        [
+            clone_route(route, prefix, tag_list, dependency_overrides_provider, default_response_class)
+            for route in router.routes
+        ]
+    )
@@ -6,7 +6,7 @@ from typing import Optional
 
 from app.database import get_db
 from app.auth.jwt import verify_token
-from app.models.admin import AdminUser
+from app.models.admin import AdminUser, AdminDetails
 from app.models.student import Student
 
 security = HTTPBearer()
@@ -62,6 +62,17 @@ def get_current_admin(
     
     return admin
 
+def get_current_admin_details(
+    current_admin: AdminUser = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+) -> Optional[AdminDetails]:
+    """Get the current admin's library details (None until the profile is saved).
+
+    FastAPI caches dependency results per request, so a handler and the
+    dependencies it shares this with read the row with a single SELECT.
+    """
+    return db.query(AdminDetails).filter(AdminDetails.user_id == current_admin.user_id).first()
+
 def get_current_student(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
+import hashlib
+import secrets
+import uuid
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -7,16 +10,50 @@ from fastapi import HTTPException, status
 from app.core.config import settings
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one uses outdated settings"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+def generate_url_token() -> Tuple[str, str]:
+    """Create an emailed one-time token; returns (token, digest to store)"""
+    token = secrets.token_urlsafe(32)
+    return token, hash_url_token(token)
+
+def hash_url_token(token: str) -> str:
+    """SHA-256 digest stored in place of an emailed one-time token"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def url_token_lookup_values(token: str) -> List[str]:
+    """Stored values that match an incoming one-time token.
+
+    Tokens issued before digests were stored are raw UUIDs; they still match
+    verbatim until used. A stored digest is never a valid UUID, so it cannot
+    be replayed as a token.
+    """
+    values = [hash_url_token(token)]
+    try:
+        uuid.UUID(token)
+    except ValueError:
+        return values
+    values.append(token)
+    return values
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -3,11 +3,16 @@ Redis cache utilities for self-hosted Redis.
 Uses REDIS_HOST, REDIS_PORT, REDIS_PASSWORD from settings.
 If Redis is unavailable, all cache operations are no-ops (app continues to work).
 """
+import inspect
 import json
 import logging
 from functools import wraps
 from typing import Any, Callable, Optional
 
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -17,8 +22,11 @@ _redis_client: Optional[Any] = None
 
 # Key prefixes for namespacing
 PREFIX_ADMIN_DASHBOARD = "admin_dashboard"
+PREFIX_ADMIN_STATS = "admin_stats"
 PREFIX_ADMIN_ATTENDANCE_TRENDS = "admin_attendance_trends"
 PREFIX_ADMIN_REVENUE_TRENDS = "admin_revenue_trends"
+PREFIX_ADMIN_RECENT_ACTIVITIES = "admin_recent_activities"
+PREFIX_ADMIN_REVENUE = "admin_revenue"
 PREFIX_STUDENT_DASHBOARD = "student_dashboard"
 PREFIX_LIBRARY_OCCUPIED = "library_occupied"
 PREFIX_ATTENDANCE_LOCATION_RATE_LIMIT = "attendance_location_rate_limit"
@@ -76,6 +84,10 @@ def admin_dashboard_key(admin_id: str) -> str:
     return cache_key(PREFIX_ADMIN_DASHBOARD, admin_id)
 
 
+def admin_stats_key(admin_id: str) -> str:
+    return cache_key(PREFIX_ADMIN_STATS, admin_id)
+
+
 def admin_attendance_trends_key(admin_id: str, days: int) -> str:
     return cache_key(PREFIX_ADMIN_ATTENDANCE_TRENDS, admin_id, days)
 
@@ -84,6 +96,14 @@ def admin_revenue_trends_key(admin_id: str, months: int) -> str:
     return cache_key(PREFIX_ADMIN_REVENUE_TRENDS, admin_id, months)
 
 
+def admin_recent_activities_key(admin_id: str, skip: int, limit: int) -> str:
+    return cache_key(PREFIX_ADMIN_RECENT_ACTIVITIES, admin_id, skip, limit)
+
+
+def admin_revenue_key(admin_id: str, filter: str, skip: int, limit: int) -> str:
+    return cache_key(PREFIX_ADMIN_REVENUE, admin_id, filter, skip, limit)
+
+
 def student_dashboard_key(student_id: str) -> str:
     return cache_key(PREFIX_STUDENT_DASHBOARD, student_id)
 
@@ -115,6 +135,18 @@ def get_cached(key: str) -> Optional[Any]:
         return None
 
 
+def get_cached_raw(key: str) -> Optional[str]:
+    """Get the stored JSON text without decoding it. None on miss or if Redis is down."""
+    client = _client()
+    if not client:
+        return None
+    try:
+        return client.get(key)
+    except Exception as e:
+        logger.debug("Cache get failed for %s: %s", key, e)
+        return None
+
+
 def set_cached(key: str, value: Any, ttl: int = 60) -> None:
     """Set a value in cache with TTL (seconds). No-op if Redis is down."""
     client = _client()
@@ -138,6 +170,17 @@ def set_if_absent(key: str, value: str, ttl: int) -> bool:
         return True
 
 
+def delete_cached(*keys: str) -> None:
+    """Delete exact keys in one round trip (no KEYS scan). No-op if Redis is down."""
+    client = _client()
+    if not client or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except Exception as e:
+        logger.debug("Cache delete failed for %s: %s", keys, e)
+
+
 def invalidate_cache(pattern: str) -> None:
     """Delete all keys matching pattern (e.g. 'admin_dashboard:*'). No-op if Redis is down."""
     client = _client()
@@ -152,10 +195,12 @@ def invalidate_cache(pattern: str) -> None:
 
 
 def invalidate_admin_caches(admin_id: str) -> None:
-    """Invalidate all admin-related caches for the given admin (dashboard, trends)."""
-    invalidate_cache(admin_dashboard_key(admin_id))
+    """Invalidate all admin-related caches for the given admin (stats, dashboard, trends, lists)."""
+    delete_cached(admin_stats_key(admin_id), admin_dashboard_key(admin_id))
     invalidate_cache(f"{PREFIX_ADMIN_ATTENDANCE_TRENDS}:{admin_id}:*")
     invalidate_cache(f"{PREFIX_ADMIN_REVENUE_TRENDS}:{admin_id}:*")
+    invalidate_cache(f"{PREFIX_ADMIN_RECENT_ACTIVITIES}:{admin_id}:*")
+    invalidate_cache(f"{PREFIX_ADMIN_REVENUE}:{admin_id}:*")
 
 
 def invalidate_student_dashboard(student_id: str) -> None:
@@ -170,28 +215,59 @@ def invalidate_library_capacity(library_id: str) -> None:
 
 def cached(ttl: int = 60, key_builder: Optional[Callable[..., str]] = None):
     """
-    Decorator to cache async function results in Redis.
+    Decorator to cache route results (sync or async) in Redis.
     key_builder: callable(*args, **kwargs) -> str. If None, key is func.__name__ (not recommended for routes with Depends).
+    Results are stored as the JSON the route would have sent, so a cache hit is returned as a raw
+    JSON Response without response_model validation or re-serialization. Only use it on routes that
+    return their response_model (or plain JSON data) with the default 200 status.
     If Redis is unavailable, the function is called normally.
     """
 
     def decorator(func: Callable) -> Callable:
+        def _key(args, kwargs) -> Optional[str]:
+            if key_builder is None:
+                return cache_key(func.__name__, *args, **kwargs)
+            try:
+                return key_builder(*args, **kwargs)
+            except Exception:
+                return None
+
+        def _store(key: str, result: Any) -> None:
+            client = _client()
+            if not client:
+                return
+            try:
+                client.setex(key, ttl, orjson.dumps(jsonable_encoder(result)))
+            except Exception as e:
+                logger.debug("Cache set failed for %s: %s", key, e)
+
+        if not inspect.iscoroutinefunction(func):
+            # Plain `def` routes run in FastAPI's threadpool; keep them sync so
+            # the Redis round trips stay off the event loop as well.
+            @wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                key = _key(args, kwargs)
+                if key:
+                    raw = get_cached_raw(key)
+                    if raw is not None:
+                        return Response(content=raw, media_type="application/json")
+                result = func(*args, **kwargs)
+                if key:
+                    _store(key, result)
+                return result
+
+            return sync_wrapper
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if key_builder is not None:
-                try:
-                    key = key_builder(*args, **kwargs)
-                except Exception:
-                    key = None
-            else:
-                key = cache_key(func.__name__, *args, **kwargs)
+            key = _key(args, kwargs)
             if key:
-                val = get_cached(key)
-                if val is not None:
-                    return val
+                raw = get_cached_raw(key)
+                if raw is not None:
+                    return Response(content=raw, media_type="application/json")
             result = await func(*args, **kwargs)
             if key:
-                set_cached(key, result, ttl)
+                _store(key, result)
             return result
 
         return async_wrapper
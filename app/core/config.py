@@ -38,6 +38,11 @@ class Settings:
         self.DB_ASYNC_POOL_SIZE = int(_env("DB_ASYNC_POOL_SIZE", "2"))
         self.DB_ASYNC_MAX_OVERFLOW = int(_env("DB_ASYNC_MAX_OVERFLOW", "3"))
         self.DB_POOL_RECYCLE = int(_env("DB_POOL_RECYCLE", "1800"))
+        # Seconds a request waits for a pooled connection before failing
+        self.DB_POOL_TIMEOUT = int(_env("DB_POOL_TIMEOUT", "30"))
+        # entrypoint: entrypoint.sh runs "alembic upgrade head" before the app starts
+        # async: the API process runs it in the background after startup
+        self.MIGRATION_MODE = _env("MIGRATION_MODE", "entrypoint").lower()  # entrypoint|async
 
         # JWT / Security
         env_secret = _env("SECRET_KEY")
@@ -53,6 +58,9 @@ class Settings:
                 )
         self.ALGORITHM = _env("JWT_ALGORITHM", "HS256")
         self.ACCESS_TOKEN_EXPIRE_MINUTES = int(_env("ACCESS_TOKEN_EXPIRE_MINUTES", "480"))  # 8 hours
+        # bcrypt cost factor for new hashes; stored hashes with a different cost are
+        # re-hashed on the next successful sign-in
+        self.BCRYPT_ROUNDS = int(_env("BCRYPT_ROUNDS", "10"))
 
         # Public web app URL (password reset / setup links in emails)
         self.FRONTEND_BASE_URL = _env("FRONTEND_BASE_URL", "http://127.0.0.1:5173").rstrip("/")
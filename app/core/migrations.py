@@ -0,0 +1,83 @@
+"""
+In-process Alembic migrations for MIGRATION_MODE=async.
+
+By default entrypoint.sh runs ``alembic upgrade head`` before uvicorn starts.
+With MIGRATION_MODE=async the entrypoint skips that step and each API process
+runs the upgrade in a worker thread after startup instead, so the health
+endpoints answer immediately and report progress via ``migration_status``.
+alembic/env.py serialises every upgrade (these workers as well as the
+worker/beat entrypoints) with a PostgreSQL advisory lock; the ones that get
+the lock after the first find the schema already at head.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ENTRYPOINT = "entrypoint"  # run by entrypoint.sh before the app started
+MIGRATION_PENDING = "pending"
+MIGRATION_RUNNING = "running"
+MIGRATION_COMPLETED = "completed"
+MIGRATION_FAILED = "failed"
+MIGRATION_STATUSES = (
+    MIGRATION_ENTRYPOINT,
+    MIGRATION_PENDING,
+    MIGRATION_RUNNING,
+    MIGRATION_COMPLETED,
+    MIGRATION_FAILED,
+)
+
+# Arbitrary application-wide key for the pg_advisory_lock taken in alembic/env.py
+MIGRATION_LOCK_KEY = 727_001
+
+_ALEMBIC_INI = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "alembic.ini",
+)
+
+# Plain string assignment is atomic; read by the health checks from any thread.
+_status: str = MIGRATION_PENDING if settings.MIGRATION_MODE == "async" else MIGRATION_ENTRYPOINT
+_task: Optional[asyncio.Task] = None
+
+
+def get_migration_status() -> str:
+    return _status
+
+
+def run_migrations() -> None:
+    """Upgrade the database to head (blocking). Updates the shared status."""
+    global _status
+    from alembic import command
+    from alembic.config import Config
+
+    from app.database import init_db
+
+    _status = MIGRATION_RUNNING
+    try:
+        config = Config(_ALEMBIC_INI)
+        # Keep the app's logging setup; env.py would otherwise re-run fileConfig.
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, "head")
+        # create_all is a no-op at head; kept for parity with the entrypoint path
+        init_db()
+    except Exception as e:
+        _status = MIGRATION_FAILED
+        logger.error(
+            "Database migration failed",
+            extra={"event": "db_migration", "error": str(e)},
+        )
+        return
+    _status = MIGRATION_COMPLETED
+    logger.info("Database migrations completed", extra={"event": "db_migration"})
+
+
+def start_migrations_in_background() -> None:
+    """Schedule run_migrations() in a worker thread on the running event loop."""
+    global _task
+    if _task is not None:
+        return
+    _task = asyncio.create_task(asyncio.to_thread(run_migrations))
@@ -1,3 +1,5 @@
+import logging
+
 import psycopg2
 from sqlalchemy_utils import database_exists, create_database
 from sqlalchemy import create_engine
@@ -9,6 +11,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from app.core.config import settings
 from sqlalchemy.engine.url import make_url
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 # Sync database setup
@@ -20,12 +24,12 @@ try:
         max_overflow=settings.DB_MAX_OVERFLOW,
         pool_pre_ping=True,
         pool_recycle=settings.DB_POOL_RECYCLE,
-        pool_timeout=30,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         echo=False,  # Set to True for SQL debugging
     )
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 except Exception as e:
-    print(f"[DB ERROR] Could not create engine or session: {e}")
+    logger.error("Could not create engine or session: %s", e)
     engine = None
     SessionLocal = None
 
@@ -39,13 +43,17 @@ try:
         max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
         pool_pre_ping=True,
         pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # asyncpg introspects types (pg_type) on each new connection; with JIT
+        # on, PostgreSQL can spend seconds compiling those catalog queries.
+        connect_args={"server_settings": {"jit": "off"}},
         echo=False,
     )
     AsyncSessionLocal = sessionmaker(
         async_engine, class_=AsyncSession, expire_on_commit=False
     )
 except Exception as e:
-    print(f"[DB ERROR] Could not create async engine or session: {e}")
+    logger.error("Could not create async engine or session: %s", e)
     async_engine = None
     AsyncSessionLocal = None
 
@@ -60,7 +68,7 @@ def ensure_database_exists():
             create_database(settings.DATABASE_URL)
         # DB exists or was created; no need to log on every startup
     except Exception as e:
-        print(f"[DB ERROR] Could not check or create database: {e}")
+        logger.error("Could not check or create database: %s", e)
 
 def init_db():
     try:
@@ -79,9 +87,9 @@ def init_db():
         if engine is not None:
             Base.metadata.create_all(bind=engine)
         else:
-            print("[DB ERROR] Engine is None, cannot create tables.")
+            logger.error("Engine is None, cannot create tables.")
     except Exception as e:
-        print(f"[DB ERROR] init_db failed: {e}")
+        logger.exception("init_db failed: %s", e)
 
 # Dependency to get database session
 def get_db():
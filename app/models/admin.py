@@ -16,7 +16,7 @@ class AdminUser(Base):
     name = Column(String, nullable=True)  # For removal service compatibility
     role = Column(String, default="admin")
     status = Column(String, default="pending")  # pending, active
-    email_verification_token = Column(String, nullable=True)
+    email_verification_token = Column(String, nullable=True, index=True)
     email_verified = Column(Boolean, default=False)
     password_reset_token = Column(String, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -31,7 +31,7 @@ class Referral(Base):
     referred_name = Column(String, nullable=False)
     referred_email = Column(String, nullable=True)
     status = Column(String, default="pending")  # pending, completed, expired
-    points_awarded = Column(String, default="0")  # Points awarded to referrer
+    points_awarded = Column(Integer, default=0)  # Points awarded to referrer
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -18,7 +18,7 @@ class Student(Base):
     last_name = Column(String, nullable=True)   # For removal service compatibility
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=True)
-    password_reset_token = Column(String, nullable=True)
+    password_reset_token = Column(String, nullable=True, index=True)
     mobile_no = Column(String(10), nullable=False)
     address = Column(Text, nullable=False)
     subscription_start = Column(DateTime(timezone=True), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Enum
+from sqlalchemy import Column, DateTime, Boolean, Text, ForeignKey, Enum, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,11 +23,22 @@ class StudentRemovalRequest(Base):
     
     # Request details
     reason = Column(Text, nullable=False, default="Subscription expired and payment not received within 2 days")
-    status = Column(Enum(RemovalRequestStatus), default=RemovalRequestStatus.PENDING, nullable=False)
+    # Stored as VARCHAR + CHECK (member names), not a native PG enum
+    status = Column(
+        Enum(
+            RemovalRequestStatus,
+            native_enum=False,
+            length=16,
+            create_constraint=True,
+            name="ck_student_removal_requests_status",
+        ),
+        default=RemovalRequestStatus.PENDING,
+        nullable=False,
+    )
     
     # Subscription details at time of request
     subscription_end_date = Column(DateTime, nullable=False)
-    days_overdue = Column(String(50), nullable=False)  # e.g., "3 days overdue"
+    days_overdue = Column(Integer, nullable=False)  # whole days past subscription_end_date
     
     # Admin action details
     admin_notes = Column(Text, nullable=True)
@@ -35,8 +46,8 @@ class StudentRemovalRequest(Base):
     processed_at = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     student = relationship("Student", back_populates="removal_requests")
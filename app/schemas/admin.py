@@ -1,8 +1,14 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
+
+def _filled(*values) -> bool:
+    """True when every value is present and not just whitespace."""
+    return all(value and (not isinstance(value, str) or value.strip()) for value in values)
+
+
 class AdminDetailsBase(BaseModel):
     admin_name: str
     library_name: str
@@ -52,12 +58,28 @@ class AdminDetailsResponse(AdminDetailsBase):
     referral_code: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    is_complete: bool = False
-    bank_details_complete: bool = False
 
     class Config:
         from_attributes = True
 
+    @computed_field
+    @property
+    def is_complete(self) -> bool:
+        return _filled(
+            self.admin_name, self.library_name, self.mobile_no, self.address
+        ) and (self.total_seats or 0) > 0
+
+    @computed_field
+    @property
+    def bank_details_complete(self) -> bool:
+        return _filled(
+            self.bank_account_holder_name,
+            self.bank_account_number,
+            self.bank_ifsc_code,
+            self.bank_name,
+            self.bank_branch_name,
+        )
+
 class AdminUserResponse(BaseModel):
     id: UUID
     user_id: UUID
@@ -121,6 +143,31 @@ class AdminAttendanceRecord(BaseModel):
     status: str  # "Present" | "Completed"
 
 
+class AdminTodayAttendanceItem(BaseModel):
+    """Single student row for GET /admin/attendance/today.
+
+    Validated straight from the endpoint's projected result rows.
+    """
+
+    student_id: str
+    student_name: str
+    auth_user_id: str
+    status: str  # "Present" | "Absent"
+    entry_time: Optional[datetime] = None
+    exit_time: Optional[datetime] = None
+    total_duration: Optional[str] = None
+
+    @field_validator("total_duration", mode="before")
+    @classmethod
+    def _duration_as_str(cls, v):
+        if isinstance(v, timedelta):
+            return str(v) if v else None
+        return v
+
+    class Config:
+        from_attributes = True
+
+
 class StudentAttendanceRecordDetail(BaseModel):
     """Nested student summary in attendance record detail."""
 
@@ -130,7 +177,10 @@ class StudentAttendanceRecordDetail(BaseModel):
 
 
 class AdminStudentAttendanceRecord(BaseModel):
-    """Single record for GET /admin/students/{student_id}/attendance."""
+    """Single record for GET /admin/students/{student_id}/attendance.
+
+    Validated straight from the endpoint's projected result rows.
+    """
 
     id: str
     student_id: str
@@ -144,6 +194,17 @@ class AdminStudentAttendanceRecord(BaseModel):
     created_at: Optional[datetime] = None
     student: StudentAttendanceRecordDetail
 
+    @field_validator("total_duration", mode="before")
+    @classmethod
+    def _duration_as_str(cls, v):
+        # Keep Python's timedelta text ("1:30:00"), not Postgres interval text
+        if isinstance(v, timedelta):
+            return str(v) if v else None
+        return v
+
+    class Config:
+        from_attributes = True
+
 
 class AdminRevenueItem(BaseModel):
     """Single revenue/transaction item for GET /admin/revenue."""
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, EmailStr, model_validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, model_validator
+from typing import Annotated, Optional
 from datetime import datetime
 
+# Emails are stored lowercase; normalize request input once at the schema layer
+LowerEmailStr = Annotated[EmailStr, AfterValidator(str.lower)]
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -11,7 +14,7 @@ class TokenData(BaseModel):
     user_type: Optional[str] = None
 
 class AdminSignUp(BaseModel):
-    email: EmailStr
+    email: LowerEmailStr
     password: str
     library_name: Optional[str] = None
     mobile_no: Optional[str] = None
@@ -20,11 +23,11 @@ class AdminSignUp(BaseModel):
     email_verified: bool = False
 
 class AdminSignIn(BaseModel):
-    email: EmailStr
+    email: LowerEmailStr
     password: str
 
 class AdminResendVerificationRequest(BaseModel):
-    email: EmailStr
+    email: LowerEmailStr
 
 class StudentSignUp(BaseModel):
     email: EmailStr
@@ -39,7 +42,7 @@ class StudentSignUp(BaseModel):
     shift_time: Optional[str] = None
 
 class StudentSignUpByAdmin(BaseModel):
-    email: EmailStr
+    email: LowerEmailStr
     name: str
     mobile_no: str
     address: str
@@ -57,14 +60,14 @@ class PasswordChange(BaseModel):
     new_password: str
 
 class PasswordReset(BaseModel):
-    email: EmailStr
+    email: LowerEmailStr
 
 
 class StudentForgotPasswordRequest(BaseModel):
     """Provide student_id (e.g. LIBR25001) and/or email; at least one required."""
 
     student_id: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[LowerEmailStr] = None
 
     @model_validator(mode="after")
     def require_identifier(self):
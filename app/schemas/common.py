@@ -1,6 +1,6 @@
 """Common response schemas used across API endpoints."""
 from pydantic import BaseModel
-from typing import List, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic
 
 T = TypeVar("T")
 
@@ -18,3 +18,23 @@ class PaginatedResponse(BaseModel, Generic[T]):
         if self.page_size <= 0:
             return 0
         return (self.total + self.page_size - 1) // self.page_size
+
+
+class CursorPaginatedResponse(PaginatedResponse[T], Generic[T]):
+    """Paginated response that can also be continued with a keyset cursor.
+
+    ``next_cursor`` is set when more rows follow and the listing order supports
+    cursors; pass it back as ``cursor`` to fetch the next page.
+    """
+
+    next_cursor: Optional[str] = None
+
+
+class OffsetPaginatedResponse(PaginatedResponse[T], Generic[T]):
+    """Paginated response for skip/limit listings.
+
+    ``has_more`` is set when rows follow this page; request the next one with
+    ``skip`` advanced by ``page_size``.
+    """
+
+    has_more: bool = False
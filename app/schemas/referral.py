@@ -24,7 +24,7 @@ class ReferralBase(BaseModel):
     referred_name: str
     referred_email: Optional[str] = None
     status: str = "pending"  # pending, completed, expired
-    points_awarded: str = "0"
+    points_awarded: int = 0
     notes: Optional[str] = None
 
 class ReferralCreate(ReferralBase):
@@ -36,7 +36,7 @@ class ReferralUpdate(BaseModel):
     status: Optional[str] = None
     referred_id: Optional[UUID] = None
     referred_type: Optional[str] = None
-    points_awarded: Optional[str] = None
+    points_awarded: Optional[int] = None
     notes: Optional[str] = None
     completed_at: Optional[datetime] = None
 
@@ -16,7 +16,7 @@ class StudentRemovalRequestCreate(BaseModel):
     admin_id: UUID
     reason: str = "Subscription expired and payment not received within 2 days"
     subscription_end_date: datetime
-    days_overdue: str
+    days_overdue: int
 
 class StudentRemovalRequestResponse(BaseModel):
     id: UUID
@@ -25,7 +25,7 @@ class StudentRemovalRequestResponse(BaseModel):
     reason: str
     status: RemovalRequestStatus
     subscription_end_date: datetime
-    days_overdue: str
+    days_overdue: int
     admin_notes: Optional[str] = None
     processed_by: Optional[UUID] = None
     processed_at: Optional[datetime] = None
@@ -14,7 +14,7 @@ def auto_checkout_stale_attendance_sessions(db: Session) -> int:
     )
 
     stale_sessions = (
-        db.query(StudentAttendance)
+        db.query(StudentAttendance, Student)
         .join(Student, Student.auth_user_id == StudentAttendance.student_id)
         .filter(
             StudentAttendance.exit_time.is_(None),
@@ -31,7 +31,7 @@ def auto_checkout_stale_attendance_sessions(db: Session) -> int:
     affected_students = set()
     now_utc = datetime.now(timezone.utc)
 
-    for attendance in stale_sessions:
+    for attendance, student in stale_sessions:
         attendance.exit_time = now_utc
 
         if attendance.entry_time.tzinfo is None:
@@ -41,15 +41,9 @@ def auto_checkout_stale_attendance_sessions(db: Session) -> int:
 
         attendance.total_duration = attendance.exit_time - entry_time_aware
 
-        student = (
-            db.query(Student)
-            .filter(Student.auth_user_id == attendance.student_id)
-            .first()
-        )
-        if student:
-            student.status = "Absent"
-            affected_admins.add(str(student.admin_id))
-            affected_students.add(str(student.auth_user_id))
+        student.status = "Absent"
+        affected_admins.add(str(student.admin_id))
+        affected_students.add(str(student.auth_user_id))
 
     db.commit()
 
@@ -227,21 +227,11 @@ def complete_transfer_payment(db: Session, payment_reference: str) -> StudentTra
     for booking in source_active_bookings:
         booking.status = "cancelled"
 
-    # Generate a new library-scoped student_id based on the target admin's library.
-    # generate_student_id is async, but our context is sync; fall back to old ID if it fails.
-    new_student_id: str | None = None
+    # Generate a new library-scoped student_id based on the target admin's library;
+    # keep the old ID if the target library has no details yet.
     try:
-        import asyncio
-
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # In case we're already in an event loop, don't break it; keep old ID.
-            new_student_id = None
-        else:
-            new_student_id = loop.run_until_complete(
-                generate_student_id(str(transfer.target_admin_id), db)
-            )
-    except Exception:
+        new_student_id = generate_student_id(str(transfer.target_admin_id), db)
+    except ValueError:
         new_student_id = None
 
     student.admin_id = transfer.target_admin_id
@@ -360,7 +360,7 @@ class StudentRemovalService:
                         admin_id=admin_pk,
                         reason="Subscription expired — renew online or pay at library; otherwise approve removal.",
                         subscription_end_date=student.subscription_end,
-                        days_overdue=f"{days_overdue} days overdue" if days_overdue else "expires today",
+                        days_overdue=days_overdue,
                     )
                     
                     self.create_removal_request(request_data)
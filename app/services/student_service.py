@@ -1,12 +1,20 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from sqlalchemy import func, select
 from app.models.admin import AdminDetails
 from app.models.student import Student
 
-async def generate_student_id(admin_id: str, db: Session) -> str:
-    """Generate a unique student ID for the given admin"""
+def generate_student_id(
+    admin_id: str, db: Session, admin_details: Optional[AdminDetails] = None
+) -> str:
+    """Generate a unique student ID for the given admin.
+
+    Pass ``admin_details`` when the caller already holds the admin's row.
+    """
     # Get admin details to get library name
-    admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == admin_id).first()
+    if admin_details is None:
+        admin_details = db.query(AdminDetails).filter(AdminDetails.user_id == admin_id).first()
     if not admin_details:
         raise ValueError("Admin details not found")
     
@@ -20,22 +28,25 @@ async def generate_student_id(admin_id: str, db: Session) -> str:
     if len(library_prefix) < 4:
         library_prefix = library_prefix.ljust(4, 'L')
 
-    # Get all students with this library prefix and year
-    existing_students = db.query(Student).filter(
-        Student.student_id.like(f"{library_prefix}{year}%"),
-        Student.admin_id == admin_id
-    ).all()
-    
+    # Scan only the ID column of students with this library prefix and year
+    existing_ids = (
+        db.query(Student.student_id)
+        .filter(
+            Student.student_id.like(f"{library_prefix}{year}%"),
+            Student.admin_id == admin_id
+        )
+        .yield_per(500)
+    )
+
     max_sequence = 0
-    if existing_students:
-        # Extract sequence numbers from existing IDs and find the maximum
-        for student in existing_students:
-            try:
-                sequence = int(student.student_id[-3:])
-                max_sequence = max(max_sequence, sequence)
-            except (ValueError, IndexError):
-                continue
-    
+    # Extract sequence numbers from existing IDs and find the maximum
+    for (student_id,) in existing_ids:
+        try:
+            sequence = int(student_id[-3:])
+            max_sequence = max(max_sequence, sequence)
+        except (ValueError, IndexError, TypeError):
+            continue
+
     # Increment sequence number
     next_sequence = max_sequence + 1
     
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, or_
 from datetime import datetime, timedelta, timezone, date
 from typing import List, Optional
 from uuid import UUID
@@ -47,13 +47,24 @@ class SubscriptionNotificationService:
         """Notify Active students only on milestone days: 5, 3, and 1 day(s) before expiry (once per calendar day)."""
         results = []
         today: date = datetime.now(timezone.utc).date()
-        milestone_end_dates = [today + timedelta(days=d) for d in (5, 3, 1)]
+        # Half-open UTC day ranges rather than date(subscription_end) IN (...),
+        # so the predicate can use ix_students_active_subscription_end.
+        today_start = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+        milestone_days = [today_start + timedelta(days=d) for d in (5, 3, 1)]
 
         students_to_warn = (
             self.db.query(Student)
             .filter(
                 Student.subscription_status == "Active",
-                func.date(Student.subscription_end).in_(milestone_end_dates),
+                or_(
+                    *(
+                        and_(
+                            Student.subscription_end >= day_start,
+                            Student.subscription_end < day_start + timedelta(days=1),
+                        )
+                        for day_start in milestone_days
+                    )
+                ),
             )
             .all()
         )
@@ -0,0 +1,25 @@
+"""Helpers for filtering attendance rows by calendar day."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import and_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.student import StudentAttendance
+
+
+def entry_on_day(day: date) -> ColumnElement:
+    """``entry_time`` within the UTC calendar ``day`` as a half-open range.
+
+    Same rows as ``date(entry_time) = day`` on a UTC session, but sargable: it
+    can use the (admin_id, entry_time) / (student_id, entry_time) indexes,
+    whereas date() is not immutable for timestamptz and cannot be indexed.
+    The bounds are tz-aware so they mean the same under psycopg2 and asyncpg
+    (which reads naive datetimes as the server's local time).
+    """
+    day_start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+    return and_(
+        StudentAttendance.entry_time >= day_start,
+        StudentAttendance.entry_time < day_start + timedelta(days=1),
+    )
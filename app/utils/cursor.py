@@ -0,0 +1,23 @@
+"""Opaque cursors for keyset (seek) pagination on ``(created_at, id)``."""
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Cursor pointing just past the row with this ``(created_at, id)``."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -25,8 +25,14 @@ done
 # Always run migrations - alembic upgrade head is idempotent and safe on existing DBs.
 # Skipping migrations when tables already exist caused schema drift when new migrations
 # were added after the initial deployment.
-echo "==> Running Alembic migrations..."
-if [ -f "alembic.ini" ]; then
+# With MIGRATION_MODE=async the web process runs them itself after startup
+# (see app/core/migrations.py); worker/beat still migrate here. alembic/env.py
+# takes a PostgreSQL advisory lock, so these runs never race the API's upgrade.
+: "${MIGRATION_MODE:=entrypoint}"
+if [ "${MIGRATION_MODE}" = "async" ] && [ "${RUN_MODE}" = "web" ]; then
+  echo "==> MIGRATION_MODE=async, migrations will run in the API process"
+elif [ -f "alembic.ini" ]; then
+  echo "==> Running Alembic migrations..."
   python -m alembic upgrade head || {
     echo "❌ Alembic migration failed" >&2
     exit 1
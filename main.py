@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 import os
@@ -10,8 +10,10 @@ import uuid
 import logging
 
 from app.core.config import settings
+from app.core.migrations import MIGRATION_FAILED, get_migration_status, start_migrations_in_background
 from app.core.mime_guess import get_mime_from_buffer
 from app.api.api_v1.api import api_router
+from app.api.routing import include_flat
 from app.database import engine, init_db, get_db
 from app.models import Base
 from app.services.notification_scheduler import start_notification_scheduler, stop_notification_scheduler
@@ -53,7 +55,8 @@ app = FastAPI(
     description="FastAPI backend for Library Management System",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 limiter = get_rate_limiter()
@@ -83,8 +86,15 @@ os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 # Mount static files for uploads
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
-# Include API router
-app.include_router(api_router, prefix="/api/v1")
+# Include API router. Its routes are copied straight into app.router (one flat
+# route table, no re-initialisation per route); see app.api.routing.
+include_flat(
+    app.router,
+    api_router,
+    prefix="/api/v1",
+    dependency_overrides_provider=app,
+    default_response_class=app.router.default_response_class,
+)
 
 # Add OPTIONS handler for CORS preflight requests
 @app.options("/{full_path:path}")
@@ -96,19 +106,23 @@ async def options_handler():
 @app.on_event("startup")
 async def startup_event():
     """Create database tables on startup and start notification scheduler."""
-    try:
-        init_db()
-    except Exception as e:
-        logger.error(
-            "Database initialization failed",
-            extra={"event": "db_init", "error": str(e)},
-        )
+    if settings.MIGRATION_MODE == "async":
+        # Migrations (followed by init_db) run in the background; /health reports progress
+        start_migrations_in_background()
+    else:
+        try:
+            init_db()
+        except Exception as e:
+            logger.error(
+                "Database initialization failed",
+                extra={"event": "db_init", "error": str(e)},
+            )
     
     # Start the notification scheduler if enabled
     if getattr(settings, "EMAIL_SCHEDULER_ENABLED", True) and getattr(settings, "SCHEDULER_OWNER", "worker") == "api":
         await start_notification_scheduler()
     else:
-        print("[Scheduler] API scheduler disabled (managed by worker/beat or config).")
+        logger.info("API scheduler disabled (managed by worker/beat or config).")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -157,6 +171,12 @@ async def health_check():
         health_status["status"] = "unhealthy"
         health_status["database"] = f"error: {str(e)}"
 
+    # A failed MIGRATION_MODE=async upgrade leaves the schema half-migrated
+    migration_status = get_migration_status()
+    health_status["migration_status"] = migration_status
+    if migration_status == MIGRATION_FAILED:
+        health_status["status"] = "unhealthy"
+
     # Check Redis cache (optional)
     try:
         from app.core.cache import get_redis